@@ -11,6 +11,20 @@ os.chdir(os.path.normpath(os.path.join(os.path.abspath(__file__), os.pardir)))
 with open("requirements/base.txt", "r") as fh:
     requirements = fh.read().splitlines()
 
+# The config validators are pure-Python dict traversal, which mypyc can compile into
+# a nice drop-in speedup. The compile step is strictly opt-in (set VNET_MANAGER_MYPYC=1)
+# and any failure (mypyc missing, mypy errors, no C toolchain) falls back to the
+# pure-Python modules instead of breaking the install.
+ext_modules = []
+if os.environ.get("VNET_MANAGER_MYPYC") == "1":
+    try:
+        from mypyc.build import mypycify
+
+        ext_modules = mypycify(["vnet_manager/config/validate.py", "vnet_manager/config/_compiled.py"])
+    except (ImportError, SystemExit, Exception) as e:  # pylint: disable=broad-except
+        print(f"mypyc compilation unavailable ({e}), installing the pure-Python modules")
+        ext_modules = []
+
 setup(
     name="vnet-manager",
     version=VERSION,
@@ -20,6 +34,7 @@ setup(
     author="Erik Lamers",
     license="MIT",
     install_requires=requirements,
+    ext_modules=ext_modules,
     entry_points={
         "console_scripts": [
             "vnet-manager = vnet_manager.vnet_manager:main",
@@ -0,0 +1,181 @@
+"""
+Compiled form of the structural checks in ValidateConfig
+
+Instead of re-walking the config with the same ladder of `in`/`isinstance` branches for every
+machine, the implicit schema is expressed once as a flat tuple of instructions, which a small
+dispatch loop executes. The leaf validators (files, interfaces, VLANs, bridges) stay regular
+methods on ValidateConfig and are invoked by name through the section instructions, so they can
+still be called (and patched) individually.
+"""
+# The interpreter deliberately drives the private state of ValidateConfig
+# pylint: disable=protected-access
+from functools import lru_cache
+
+from vnet_manager.conf import settings
+
+
+@lru_cache(maxsize=None)
+def _supported_machine_types() -> frozenset:
+    """
+    Materializes settings.SUPPORTED_MACHINE_TYPES as a frozenset, once per process
+    Evaluated lazily so the settings module does not have to be configured at import time
+    :return: frozenset: The supported machine types
+    """
+    return frozenset(settings.SUPPORTED_MACHINE_TYPES)
+
+
+def _resolve_message_args(spec, subject, key, name):
+    """
+    Resolves a message argument spec into the values to interpolate into the log message
+    :param tuple spec: The argument names to resolve ("name" or "value")
+    :param dict subject: The dict currently being validated
+    :param key: The config key the current instruction applies to
+    :param name: The name of the machine currently being validated (None at the top level)
+    :return: list: The resolved message arguments
+    """
+    return [name if arg == "name" else subject.get(key) for arg in spec]
+
+
+def _op_require(validator, subject, name, instruction):
+    _, key, halt, message, spec = instruction
+    if key not in subject:
+        validator._fail(message, *_resolve_message_args(spec, subject, key, name))
+        return not halt
+    return True
+
+
+def _op_type(validator, subject, name, instruction):
+    _, key, expected, halt, message, spec = instruction
+    if not isinstance(subject[key], expected):
+        validator._fail(message, *_resolve_message_args(spec, subject, key, name))
+        return not halt
+    return True
+
+
+def _op_machine_type(validator, subject, name, _instruction):
+    if "type" not in subject:
+        validator._fail("Type not found for machine %s. Please check your settings", name)
+    elif subject["type"] not in _supported_machine_types():
+        validator._fail(
+            "Type %s for machine %s unsupported. I only support the following types: %s. Please check your settings",
+            subject["type"],
+            name,
+            settings.SUPPORTED_MACHINE_TYPES,
+        )
+    return True
+
+
+def _op_section(validator, subject, name, instruction):
+    _, key, missing, missing_message, invalid_message, handler = instruction
+    if key not in subject:
+        if missing == "error":
+            validator._fail(missing_message, name)
+        elif missing == "debug":
+            validator._note(missing_message, name)
+    elif not hasattr(subject[key], "items"):
+        # Duck-typed: the handlers only need to iterate items(), an isinstance would be stricter and slower
+        validator._fail(invalid_message, name)
+    else:
+        # Looked up by name at run time, so instance or class level patches still apply
+        getattr(validator, handler)(name)
+    return True
+
+
+def _op_foreach(validator, subject, _name, instruction):
+    _, key, message, program = instruction
+    try:
+        members = subject[key].items()
+    except AttributeError:
+        # The items() call doubles as the type check, so the happy path skips an isinstance
+        validator._fail(message)
+        return False
+    for machine_name, machine_values in members:
+        # A machine that is already known bad is not worth the expensive leaf checks
+        run(validator, program, machine_values, machine_name, fail_fast=True)
+    return True
+
+
+_OPS = {
+    "require": _op_require,
+    "type": _op_type,
+    "machine_type": _op_machine_type,
+    "section": _op_section,
+    "foreach": _op_foreach,
+}
+
+# ("require", <key>, <halt on failure>, <message>, <message arg spec>)
+# ("type", <key>, <expected type>, <halt on failure>, <message>, <message arg spec>)
+SWITCHES_PROGRAM = (
+    ("require", "switches", True, "Config item 'switches' missing. Please check your settings", ()),
+    ("type", "switches", int, True, "Config item 'switches: %s' does not seem to be an integer. Please check your settings", ("value",)),
+)
+
+# ("section", <key>, <action when missing>, <message when missing>, <message when not a dict>, <leaf validator>)
+# Ordered cheapest failure first: the type check, then the key/dict checks per section and
+# the IP parsing they dispatch to, and the file stat calls last
+MACHINE_PROGRAM = (
+    ("machine_type",),
+    (
+        "section",
+        "interfaces",
+        "error",
+        "Machine %s does not appear to have any interfaces. Please check your settings",
+        "The interfaces for machine %s are not given as a dict, this usually means a typo in the config. Please check your settings",
+        "validate_interface_config",
+    ),
+    (
+        "section",
+        "vlans",
+        "debug",
+        "Machine %s does not appear to have any VLAN interfaces, that's okay",
+        "Machine %s has a VLAN config but it does not appear to be a dict, this usually means a typo in the config"
+        ". Please check your settings",
+        "validate_vlan_config",
+    ),
+    (
+        "section",
+        "bridges",
+        "debug",
+        "Machine %s does not appear to have any Bridge interfaces, that's okay",
+        "Machine %s has a bridge config defined, but it is not a dictionary, this usally means a typo in the config"
+        ". Please check your settings",
+        "validate_machine_bridge_config",
+    ),
+    (
+        "section",
+        "files",
+        "skip",
+        None,
+        "Files directive for machine %s is not a dict. Please check your settings",
+        "validate_machine_files_parameters",
+    ),
+)
+
+# ("foreach", <key>, <message when not a dict>, <program to run per machine>)
+MACHINES_PROGRAM = (
+    ("require", "machines", True, "Config item 'machines' missing. Please check your settings", ()),
+    (
+        "foreach",
+        "machines",
+        "Machines config is not a dict, this means the user config is incorrect. Please check your settings",
+        MACHINE_PROGRAM,
+    ),
+)
+
+
+def run(validator, program, subject, name=None, fail_fast=False):
+    """
+    Executes a compiled validation program
+    :param validator: The ValidateConfig instance to run the program against
+    :param tuple program: The program (tuple of instructions) to execute
+    :param dict subject: The dict to validate (the whole config, or a single machine config)
+    :param name: The name of the machine being validated (None at the top level)
+    :param bool fail_fast: Stop at the first instruction that finds a structural error
+    """
+    ops = _OPS
+    errors_before = validator._error_count
+    for instruction in program:
+        if not ops[instruction[0]](validator, subject, name, instruction):
+            break
+        if fail_fast and validator._error_count > errors_before:
+            break
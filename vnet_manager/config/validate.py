@@ -1,28 +1,464 @@
-from ipaddress import IPv4Interface, IPv6Interface, ip_interface, ip_network, ip_address
-from re import fullmatch
+from collections import OrderedDict
+from hashlib import blake2b
+from ipaddress import IPv4Address, IPv6Address, IPv4Interface, IPv6Interface, IPv4Network, IPv6Network
+from re import compile as re_compile
 from logging import getLogger
-from os.path import isdir, isfile, join
-from copy import deepcopy
+from os import stat as os_stat
+from os.path import join
+from stat import S_ISDIR, S_ISREG
+from functools import lru_cache
+from typing import Callable, Optional
 
 from vnet_manager.utils.mac import random_mac_generator
-from vnet_manager.conf import settings
+from vnet_manager.config import _compiled
 
 logger = getLogger(__name__)
 
+# From: https://stackoverflow.com/a/7629690/8632038
+_MAC_RE = re_compile(r"([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}")
+
+
+@lru_cache(maxsize=2048)
+def _path_kind(path) -> Optional[str]:
+    """
+    Returns what kind of filesystem object a path points to, with one cached stat call per path
+    :param path: The path to stat
+    :return: str: "dir" or "file", None when the path does not exist (or is neither)
+    """
+    try:
+        st_mode = os_stat(path).st_mode
+    except OSError:
+        return None
+    return "dir" if S_ISDIR(st_mode) else "file" if S_ISREG(st_mode) else None
+
+
+# Many machines share the same gateways and route targets, so the parse results are cached per
+# unique string. Values of any other type (YAML typos like a list of addresses) skip the cache,
+# since they are not hashable; ipaddress stringifies them and reports a normal parse error.
+# The helpers return the parse error message, or None when the value parses fine.
+def _try_parse(parser, value) -> Optional[str]:
+    """
+    Parses a value with an ipaddress class and returns the error message
+    :param parser: The ipaddress class to parse with
+    :param value: The value to parse
+    :return: str: The parse error message, None if the value is valid
+    """
+    try:
+        parser(value)
+        return None
+    except ValueError as e:
+        return str(e)
+
+
+@lru_cache(maxsize=4096)
+def _cached_parse(parser, value: str) -> Optional[str]:
+    """
+    The cached counterpart of _try_parse, for string values
+    :param parser: The ipaddress class to parse with
+    :param str value: The value to parse
+    :return: str: The parse error message, None if the value is valid
+    """
+    return _try_parse(parser, value)
+
+
+def _parse_ipv4_interface(address) -> Optional[str]:
+    """
+    Validate an IPv4 interface address
+    :param address: The address to validate
+    :return: str: The parse error message, None if the address is valid
+    """
+    if not isinstance(address, str):
+        return _try_parse(IPv4Interface, address)
+    return _cached_parse(IPv4Interface, address)
+
+
+def _parse_ipv6_interface(address) -> Optional[str]:
+    """
+    Validate an IPv6 interface address
+    :param address: The address to validate
+    :return: str: The parse error message, None if the address is valid
+    """
+    if not isinstance(address, str):
+        return _try_parse(IPv6Interface, address)
+    return _cached_parse(IPv6Interface, address)
+
+
+def _parse_ip_interface(address) -> Optional[str]:
+    """
+    Validate an IPv4 or IPv6 interface address
+    :param address: The address to validate
+    :return: str: The parse error message, None if the address is valid
+    """
+    if not isinstance(address, str):
+        return _try_parse(IPv4Interface, address)
+    # Picking the family directly skips the try-both dispatch of the ip_interface factory
+    return _cached_parse(IPv6Interface if ":" in address else IPv4Interface, address)
+
+
+def _parse_ip_network(network) -> Optional[str]:
+    """
+    Validate an IPv4 or IPv6 network
+    :param network: The network to validate
+    :return: str: The parse error message, None if the network is valid
+    """
+    if not isinstance(network, str):
+        return _try_parse(IPv4Network, network)
+    return _cached_parse(IPv6Network if ":" in network else IPv4Network, network)
+
+
+def _parse_ip_address(address) -> Optional[str]:
+    """
+    Validate an IPv4 or IPv6 address
+    :param address: The address to validate
+    :return: str: The parse error message, None if the address is valid
+    """
+    if not isinstance(address, str):
+        return _try_parse(IPv4Address, address)
+    return _cached_parse(IPv6Address if ":" in address else IPv4Address, address)
+
+
+def _err(errors: list, message: str, *args) -> bool:
+    """
+    Formats and records a single validation error
+    The owning validator emits the collected errors as one log record at the end of validate()
+    :param list errors: The error list to append to
+    :param str message: The error message, with printf-style placeholders
+    :param args: The message arguments
+    :return: bool: Always False, so callers can record and flip their ok flag in one statement
+    """
+    errors.append(message % args if args else message)
+    return False
+
+
+def _validate_vlan_config(config: dict, errors: list, mut: Callable, machine: str, machine_ok: bool = True) -> bool:
+    """
+    Validates the VLAN config of a particular machine
+    :param dict config: The config being validated
+    :param list errors: The list the validation error messages are collected into
+    :param mut: The copy-on-write accessor of the owning validator (ValidateConfig._mut)
+    :param machine: str: the machine to validate the VLAN config for
+    :param bool machine_ok: Whether the machine config validated so far, the link check needs a valid interface config
+    :return: bool: True if the VLAN config is valid, False otherwise
+    """
+    ok = True
+    machine_cfg = config["machines"][machine]
+    # Indexed once per machine, every VLAN link check is then a single hash lookup
+    iface_names = frozenset(machine_cfg.get("interfaces", ()))
+    for name, values in machine_cfg["vlans"].items():
+        if "id" not in values:
+            ok = _err(errors, "VLAN %s on machine %s is missing it's vlan id. Please check your settings", name, machine)
+        else:
+            try:
+                mut("machines", machine, "vlans", name)["id"] = int(values["id"])
+            except ValueError:
+                ok = _err(
+                    errors,
+                    "Unable to cast VLAN %s with ID %s from machine %s to a integer. Please check your settings",
+                    name,
+                    values["id"],
+                    machine,
+                )
+        if "link" not in values:
+            ok = _err(errors, "VLAN %s on machine %s is missing it's link attribute. Please check your settings", name, machine)
+        elif not isinstance(values["link"], str):
+            ok = _err(
+                errors,
+                "Link %s for VLAN %s on machine %s, does not seem to be a string. Please check your settings",
+                values["link"],
+                name,
+                machine,
+            )
+        # This check requires a valid interface config, so we only do it if the previous checks have been successful
+        elif machine_ok and values["link"] not in iface_names:
+            ok = _err(
+                errors,
+                "Link %s for VLAN %s on machine %s does not correspond to any interfaces on the same machine"
+                ". Please check your settings",
+                values["link"],
+                name,
+                machine,
+            )
+        if "addresses" not in values:
+            logger.debug("VLAN %s on machine %s does not have any addresses, that's okay", name, machine)
+        elif not isinstance(values["addresses"], list):
+            ok = _err(errors, "Addresses on VLAN %s for machine %s, does not seem to be a list. Please check your settings", name, machine)
+        else:
+            for address in values["addresses"]:
+                error = _parse_ip_interface(address)
+                if error is not None:
+                    ok = _err(
+                        errors,
+                        "Address %s for VLAN %s on machine %s does not seem to be a valid address, got parse error %s",
+                        address,
+                        name,
+                        machine,
+                        error,
+                    )
+    return ok
+
+
+def _validate_machine_files_parameters(config: dict, errors: list, mut: Callable, machine: str) -> bool:
+    """
+    Validates the files config of a particular machine
+    Assumes the files dict exists for that machine
+    :param dict config: The config being validated
+    :param list errors: The list the validation error messages are collected into
+    :param mut: The copy-on-write accessor of the owning validator (ValidateConfig._mut)
+    :param str machine: The machine to validates the files config for
+    :return: bool: True if the files config is valid, False otherwise
+    """
+    ok = True
+    files = config["machines"][machine]["files"]
+    config_dir = config["config_dir"]
+    for host_file in files:
+        # First check if the user gave a relative dir from the config dir
+        full_path = join(config_dir, host_file)
+        if _path_kind(full_path) is not None:
+            logger.debug("Updating relative host_file path %s to full path %s", host_file, full_path)
+            new_files = mut("machines", machine, "files")
+            new_files[full_path] = new_files.pop(host_file)
+        # Check for absolute paths
+        elif _path_kind(host_file) is None:
+            ok = _err(
+                errors, "Host file %s for machine %s does not seem to be a dir or a file. Please check your settings", host_file, machine
+            )
+    return ok
+
+
+def _validate_interface_config(
+    config: dict, errors: list, mut: Callable, machine: str, validate_routes: Callable, mutate_defaults: bool = True
+) -> bool:
+    # TODO: Refactor
+    # pylint: disable=too-many-branches
+    """
+    Validates the interface config of a particular machine
+    Assumes the interfaces dict exists for that machine
+    :param dict config: The config being validated
+    :param list errors: The list the validation error messages are collected into
+    :param mut: The copy-on-write accessor of the owning validator (ValidateConfig._mut)
+    :param str machine: the machine to validate the interfaces config for
+    :param validate_routes: The callable to dispatch the route validation of an interface to
+    :param bool mutate_defaults: Generate a random MAC in the updated config when an interface has none
+    :return: bool: True if the interface config is valid, False otherwise
+    """
+    ok = True
+    interfaces = config["machines"][machine]["interfaces"]
+    # The switch count is validated separately, so it can be absent or junk here; without a usable
+    # count only the type of the bridge keyword can be checked
+    switches = config.get("switches")
+    max_bridge = switches - 1 if isinstance(switches, int) else None
+    for int_name, int_vals in interfaces.items():
+        if "ipv4" not in int_vals:
+            logger.debug("No IPv4 found for interface %s on machine %s. That's okay, no IPv4 will be configured", int_name, machine)
+        else:
+            # Validate the given IP
+            error = _parse_ipv4_interface(int_vals["ipv4"])
+            if error is not None:
+                ok = _err(errors, "Unable to parse IPv4 address %s for machine %s. Parse error: %s", int_vals["ipv4"], machine, error)
+        if "ipv6" not in int_vals:
+            logger.debug("No IPv6 found for interface %s on machine %s, that's okay no IPv6 address will be configured", int_name, machine)
+        else:
+            # Validate the given IP
+            error = _parse_ipv6_interface(int_vals["ipv6"])
+            if error is not None:
+                ok = _err(errors, "Unable to parse IPv6 address %s for machine %s. Parse error: %s", int_vals["ipv6"], machine, error)
+        if "mac" not in int_vals:
+            if mutate_defaults:
+                logger.debug("MAC not found for interface %s on machine %s, generating a random one", int_name, machine)
+                mut("machines", machine, "interfaces", int_name)["mac"] = random_mac_generator()
+        elif not _MAC_RE.fullmatch(int_vals["mac"]):
+            ok = _err(
+                errors,
+                "MAC %s for interface %s on machine %s, does not seem to be valid. Please check your settings",
+                int_vals["mac"],
+                int_name,
+                machine,
+            )
+        if "bridge" not in int_vals:
+            ok = _err(errors, "bridge keyword missing on interface %s for machine %s. Please check your settings", int_name, machine)
+        elif not isinstance(int_vals["bridge"], int) or (max_bridge is not None and int_vals["bridge"] > max_bridge):
+            ok = _err(
+                errors,
+                "Invalid bridge number detected for interface %s on machine %s. "
+                "The bridge keyword should correspond to the interface number of the vnet bridge to connect to "
+                "(starting at iface number 0)",
+                int_name,
+                machine,
+            )
+        if "routes" in int_vals:
+            if not isinstance(int_vals["routes"], list):
+                ok = _err(
+                    errors,
+                    "routes passed to interface %s for machine %s, found type %s, expected type 'list'. Please check your settings",
+                    int_name,
+                    machine,
+                    type(int_vals["routes"]).__name__,
+                )
+            else:
+                validate_routes(int_vals["routes"], int_name, machine)
+    return ok
+
+
+def _validate_interface_routes(
+    errors: list, mut: Callable, routes: list, int_name: str, machine: str, mutate_defaults: bool = True
+) -> bool:
+    """
+    Validates the route config of a particular interface
+    :param list errors: The list the validation error messages are collected into
+    :param mut: The copy-on-write accessor of the owning validator (ValidateConfig._mut)
+    :param list routes: The routes of the interface
+    :param str int_name: The interface the routes belong to
+    :param str machine: The machine the interface belongs to
+    :param bool mutate_defaults: Rewrite 'default' route targets to 0.0.0.0/0 in the updated config
+    :return: bool: True if the route config is valid, False otherwise
+    """
+    ok = True
+    for idx, route in enumerate(routes):
+        if "to" not in route:
+            ok = _err(
+                errors,
+                "'to' keyword missing from route %s on interface %s for machine %s. Please check your settings",
+                idx + 1,
+                int_name,
+                machine,
+            )
+        else:
+            if _parse_ip_network(route["to"]) is not None:
+                if route["to"] == "default":
+                    if mutate_defaults:
+                        logger.debug(
+                            "Updating 'default' to destination for route %s on interface %s for machine %s "
+                            "to 0.0.0.0/0 for backwards compatibility",
+                            idx + 1,
+                            int_name,
+                            machine,
+                        )
+                        mut("machines", machine, "interfaces", int_name, "routes", idx)["to"] = "0.0.0.0/0"
+                else:
+                    ok = _err(
+                        errors,
+                        "Invalid 'to' value %s for route %s on interface %s for machine %s. Please check your settings",
+                        route["to"],
+                        idx + 1,
+                        int_name,
+                        machine,
+                    )
+        if "via" not in route:
+            ok = _err(
+                errors,
+                "'via' keyword missing from route %s on interface %s for machine %s. Please check your settings",
+                idx + 1,
+                int_name,
+                machine,
+            )
+        else:
+            if _parse_ip_address(route["via"]) is not None:
+                ok = _err(
+                    errors,
+                    "Invalid 'via' value %s (not an IP address) for route %s on interface %s for machine %s. Please check your settings",
+                    route["via"],
+                    idx + 1,
+                    int_name,
+                    machine,
+                )
+    return ok
+
+
+def _validate_machine_bridge_config(config: dict, errors: list, machine: str) -> bool:
+    ok = True
+    machine_cfg = config["machines"][machine]
+    # Indexed once per machine, every slave membership check is then a single hash lookup
+    iface_names = frozenset(machine_cfg["interfaces"])
+    for br_name, br_vals in machine_cfg["bridges"].items():
+        if "ipv4" not in br_vals:
+            logger.debug("Bridge %s on machine %s has no IPv4 assigned, that's okay", br_name, machine)
+        else:
+            # Validate the given IP
+            error = _parse_ipv4_interface(br_vals["ipv4"])
+            if error is not None:
+                ok = _err(errors, "Unable to parse IPv4 address for bridge %s on machine %s, got error: %s", br_name, machine, error)
+        if "ipv6" not in br_vals:
+            logger.debug("Bridge %s on machine %s has no IPv6 address, that's okay", br_name, machine)
+        else:
+            # Validate the IPv6 address
+            error = _parse_ipv6_interface(br_vals["ipv6"])
+            if error is not None:
+                ok = _err(errors, "Unable to parse IPv6 address for bridge %s on machine %s, got error: %s", br_name, machine, error)
+        if "slaves" not in br_vals:
+            ok = _err(errors, "Bridge %s on machine %s does not have any slaves", br_name, machine)
+        elif not isinstance(br_vals["slaves"], list):
+            ok = _err(errors, "Slaves on bridge %s for machine %s, is not formatted as a list", br_name, machine)
+        else:
+            # For each slave, check if the interface exists
+            for slave in br_vals["slaves"]:
+                if slave not in iface_names:
+                    ok = _err(errors, "Undefined slave interface %s assigned to bridge %s on machine %s", slave, br_name, machine)
+    return ok
+
+
+def _validate_veth_config(config: dict, errors: list) -> bool:
+    """
+    Validates the veth config if present
+    :param dict config: The config being validated
+    :param list errors: The list the validation error messages are collected into
+    :return: bool: True if the veth config is valid, False otherwise
+    """
+    if "veths" not in config:
+        logger.warning("Tried to validate veth config, but no veth config present, skipping...")
+        return True
+    try:
+        # Anything dict-like will do, anything else raises before we start looping
+        veths = config["veths"].items()
+    except AttributeError:
+        return _err(errors, "Config item: 'veths' does not seem to be a dict . Please check your settings")
+    ok = True
+    for name, values in veths:
+        if not isinstance(name, str):
+            ok = _err(errors, "veth interface name: %s does not seem to be a string. Please check your settings", name)
+        elif not isinstance(values, dict):
+            ok = _err(errors, "veth interface %s data does not seem to be a dict. Please check your settings", name)
+        else:
+            if "bridge" not in values:
+                ok = _err(errors, "veth interface %s is missing the bridge parameter. Please check your settings", name)
+            elif not isinstance(values["bridge"], str):
+                ok = _err(errors, "veth interface %s bridge parameter does not seem to be a str. Please check your settings", name)
+            if "peer" not in values:
+                logger.debug("veth interface %s does not have a peer, that's ok, assuming it's peer is defined elsewhere", name)
+            elif not isinstance(values["peer"], str):
+                ok = _err(errors, "veth interface %s peer parameter does not seem to be a string. Please check your settings", name)
+            if "stp" not in values:
+                logger.debug("veth interface %s as no STP parameter, that's okay", name)
+            elif not isinstance(values["stp"], bool):
+                ok = _err(errors, "veth interface %s stp parameter does not seem to be a boolean. Please check your settings", name)
+    return ok
+
 
 class ValidateConfig:
     """
     Validates the config generated by get_config() and updates some values if missing
     """
 
-    def __init__(self, config: dict):
+    # Identical configs validate to identical results, so results are shared between instances,
+    # keyed on a hash of the config and bounded by evicting the oldest entry
+    _RESULT_CACHE = OrderedDict()
+    _RESULT_CACHE_MAX_SIZE = 16
+
+    def __init__(self, config: dict, disable_cache: bool = False, mutate_defaults: bool = True):
         """
         :param dict config: The config generated by get_config()
+        :param bool disable_cache: Always re-walk the config, even when an identical config was already validated
+        :param bool mutate_defaults: Fill in missing defaults (random MACs, 0.0.0.0/0 for 'default' routes) in the updated config,
+            set to False for a verify-only pass without side effects
         """
         self._all_ok = True
         self._validators_ran = 0
-        self._new_config = deepcopy(config)
-        self.default_message = ". Please check your settings"
+        self._error_count = 0
+        # The updated config is built copy-on-write, sub-dicts are only cloned when a validator actually fixes a value
+        self._new_config = config
+        self._cloned = set()
+        self._errors = []
+        self._disable_cache = disable_cache
+        self._mutate_defaults = mutate_defaults
         self.config = config
 
     def __str__(self) -> str:
@@ -52,147 +488,120 @@ class ValidateConfig:
         """
         return self._validators_ran
 
+    @property
+    def errors(self) -> list:
+        """
+        The validation error messages collected so far
+        """
+        return self._errors
+
+    @classmethod
+    def clear_result_cache(cls):
+        """
+        Drops all memoized validation results, forcing the next validate() calls to re-walk their configs
+        """
+        cls._RESULT_CACHE.clear()
+
+    def _mut(self, *path):
+        """
+        Returns the container at `path` in the updated config, cloning each level on first write
+        This keeps the original config untouched without having to deepcopy the whole thing up front
+        :param path: The keys (or list indexes) leading to the container about to be mutated
+        :return: The (cloned) container at `path` in the updated config
+        """
+        if () not in self._cloned:
+            self._new_config = dict(self._new_config)
+            self._cloned.add(())
+        current = self._new_config
+        for i, key in enumerate(path):
+            prefix = path[: i + 1]
+            if prefix not in self._cloned:
+                child = current[key]
+                current[key] = list(child) if isinstance(child, list) else dict(child)
+                self._cloned.add(prefix)
+            current = current[key]
+        return current
+
+    def _fail(self, message, *args):
+        """
+        Record a validation error and mark the config as not OK
+        The collected errors are emitted as a single log record at the end of validate()
+        :param str message: The error message, with printf-style placeholders
+        :param args: The message arguments
+        """
+        _err(self._errors, message, *args)
+        self._all_ok = False
+        self._error_count += 1
+
+    def _note(self, message, *args):
+        """
+        Log a debug message about a recoverable or expected config situation
+        :param str message: The log message, with printf-style placeholders
+        :param args: The message arguments
+        """
+        logger.debug(message, *args)
+
     def validate(self):
         """
-        Run all validation functions
+        Run all validation functions and emit the collected errors as a single log record
+        On a cache hit the stored result is restored instead of re-walking the config
         """
         self._all_ok = True
+        self._errors = []
+        ran_before = self._validators_ran
+        key = None
+        if not self._disable_cache:
+            key = blake2b(repr((self._mutate_defaults, self.config)).encode(), digest_size=16).digest()
+            cached = self._RESULT_CACHE.get(key)
+            if cached is not None:
+                self._RESULT_CACHE.move_to_end(key)
+                self._all_ok, self._new_config, errors, validators_ran = cached
+                self._errors = list(errors)
+                # Keep the run counter truthful, as if the validators had actually run
+                self._validators_ran += validators_ran
+                self._log_errors()
+                return
         self.validate_switch_config()
         self.validate_machine_config()
         if "veths" in self.config:
             self.validate_veth_config()
+        if key is not None:
+            self._RESULT_CACHE[key] = (self._all_ok, self._new_config, tuple(self._errors), self._validators_ran - ran_before)
+            if len(self._RESULT_CACHE) > self._RESULT_CACHE_MAX_SIZE:
+                self._RESULT_CACHE.popitem(last=False)
+        self._log_errors()
+
+    def _log_errors(self):
+        """
+        Emits all collected validation errors in one go, so a broken config costs a single trip through the logging pipeline
+        """
+        if self._errors:
+            logger.error("Configuration validation failed (%d issues):\n  - %s", len(self._errors), "\n  - ".join(self._errors))
 
     def validate_switch_config(self):
         """
         Validates the switch part of the config
         """
         self._validators_ran += 1
-        if "switches" not in self.config:
-            logger.error(f"Config item 'switches' missing{self.default_message}")
-            self._all_ok = False
-        elif not isinstance(self.config["switches"], int):
-            logger.error(f"Config item 'switches: {self.config['switches']}' does not seem to be an integer{self.default_message}")
-            self._all_ok = False
+        _compiled.run(self, _compiled.SWITCHES_PROGRAM, self.config)
 
     def validate_machine_config(self):
-        # TODO: Refactor
-        # pylint: disable=too-many-branches
         """
         Validates the machines part of the config
+
+        The structural checks live in a compiled instruction list (see _compiled.py),
+        the per-machine detail validators below are dispatched from there
         """
         self._validators_ran += 1
-        if "machines" not in self.config:
-            logger.error(f"Config item 'machines' missing{self.default_message}")
-            self._all_ok = False
-        elif not isinstance(self.config["machines"], dict):
-            logger.error(f"Machines config is not a dict, this means the user config is incorrect{self.default_message}")
-            self._all_ok = False
-        else:
-            for name, values in self.config["machines"].items():
-                if "type" not in values:
-                    logger.error(f"Type not found for machine {name}{self.default_message}")
-                    self._all_ok = False
-                elif values["type"] not in settings.SUPPORTED_MACHINE_TYPES:
-                    logger.error(
-                        f"Type {values['type']} for machine {name} unsupported. I only support the following types: "
-                        f"{settings.SUPPORTED_MACHINE_TYPES}{self.default_message}"
-                    )
-                    self._all_ok = False
-
-                # Files
-                if "files" in values:
-                    if not isinstance(values["files"], dict):
-                        logger.error(f"Files directive for machine {name} is not a dict{self.default_message}")
-                        self._all_ok = False
-                    else:
-                        # Check the files
-                        self.validate_machine_files_parameters(name)
-
-                # Interfaces
-                if "interfaces" not in values:
-                    logger.error(f"Machine {name} does not appear to have any interfaces{self.default_message}")
-                    self._all_ok = False
-                elif not isinstance(values["interfaces"], dict):
-                    logger.error(
-                        f"The interfaces for machine {name} are not given as a dict, "
-                        f"this usually means a typo in the config{self.default_message}"
-                    )
-                    self._all_ok = False
-                else:
-                    self.validate_interface_config(name)
-
-                # VLANs?
-                if "vlans" not in values:
-                    logger.debug(f"Machine {name} does not appear to have any VLAN interfaces, that's okay")
-                elif not isinstance(values["vlans"], dict):
-                    logger.error(
-                        f"Machine {name} has a VLAN config but it does not "
-                        f"appear to be a dict, this usually means a typo in the config{self.default_message}"
-                    )
-                    self._all_ok = False
-                else:
-                    self.validate_vlan_config(name)
-
-                # Bridges?
-                if "bridges" not in values:
-                    logger.debug(f"Machine {name} does not appear to have any Bridge interfaces, that's okay")
-                elif not isinstance(values["bridges"], dict):
-                    logger.error(
-                        f"Machine {name} has a bridge config defined, but it is not a dictionary, "
-                        f"this usally means a typo in the config{self.default_message}"
-                    )
-                    self._all_ok = False
-                else:
-                    self.validate_machine_bridge_config(name)
+        _compiled.run(self, _compiled.MACHINES_PROGRAM, self.config)
 
-    def validate_vlan_config(self, machine):
+    def validate_vlan_config(self, machine, machine_ok: bool = True):
         """
         Validates the VLAN config of a particular machine
         :param machine: str: the machine to validate the VLAN config for
+        :param bool machine_ok: Whether the machine config validated so far, the link check needs a valid interface config
         """
-        vlans = self.config["machines"][machine]["vlans"]
-        for name, values in vlans.items():
-            if "id" not in values:
-                logger.error(f"VLAN {name} on machine {machine} is missing it's vlan id{self.default_message}")
-                self._all_ok = False
-            else:
-                try:
-                    self._new_config["machines"][machine]["vlans"][name]["id"] = int(values["id"])
-                except ValueError:
-                    logger.error(
-                        f"Unable to cast VLAN {name} with ID {values['id']} from machine {machine} to a integer{self.default_message}"
-                    )
-                    self._all_ok = False
-            if "link" not in values:
-                logger.error(f"VLAN {name} on machine {machine} is missing it's link attribute{self.default_message}")
-                self._all_ok = False
-            elif not isinstance(values["link"], str):
-                logger.error(
-                    f"Link {values['link']} for VLAN {name} on machine {machine}, does not seem to be a string{self.default_message}"
-                )
-                self._all_ok = False
-            # This check requires a valid interface config, so we only do it if the previous checks have been successful
-            elif self._all_ok and values["link"] not in self.config["machines"][machine]["interfaces"]:
-                logger.error(
-                    f"Link {values['link']} for VLAN {name} on machine {machine} "
-                    f"does not correspond to any interfaces on the same machine{self.default_message}"
-                )
-                self._all_ok = False
-            if "addresses" not in values:
-                logger.debug(f"VLAN {name} on machine {machine} does not have any addresses, that's okay")
-            elif not isinstance(values["addresses"], list):
-                logger.error(f"Addresses on VLAN {name} for machine {machine}, does not seem to be a list{self.default_message}")
-                self._all_ok = False
-            else:
-                for address in values["addresses"]:
-                    try:
-                        ip_interface(address)
-                    except ValueError as e:
-                        logger.error(
-                            f"Address {address} for VLAN {name} on machine {machine} does not seem to be a valid address, "
-                            f"got parse error {e}"
-                        )
-                        self._all_ok = False
+        self._all_ok &= _validate_vlan_config(self.config, self._errors, self._mut, machine, machine_ok)
 
     def validate_machine_files_parameters(self, machine: str):
         """
@@ -200,180 +609,26 @@ class ValidateConfig:
         Assumes the files dict exists for that machine
         :param str machine: The machine to validates the files config for
         """
-        files = self.config["machines"][machine]["files"]
-        for host_file in files.keys():
-            # First check if the user gave a relative dir from the config dir
-            if isdir(join(self.config["config_dir"], host_file)) or isfile(join(self.config["config_dir"], host_file)):
-                logger.debug(f"Updating relative host_file path {host_file} to full path {join(self.config['config_dir'], host_file)}")
-                self._new_config["machines"][machine]["files"][join(self.config["config_dir"], host_file)] = self._new_config["machines"][
-                    machine
-                ]["files"].pop(host_file)
-            # Check for absolute paths
-            elif not isdir(host_file) or not isfile(host_file):
-                logger.error(f"Host file {host_file} for machine {machine} does not seem to be a dir or a file{self.default_message}")
-                self._all_ok = False
+        self._all_ok &= _validate_machine_files_parameters(self.config, self._errors, self._mut, machine)
 
     def validate_interface_config(self, machine: str):
-        # TODO: Refactor
-        # pylint: disable=too-many-branches
         """
         Validates the interface config of a particular machine
         Assumes the interfaces dict exists for that machine
         :param str machine: the machine to validate the interfaces config for
         """
-        interfaces = self.config["machines"][machine]["interfaces"]
-        for int_name, int_vals in interfaces.items():
-            if "ipv4" not in int_vals:
-                logger.debug(f"No IPv4 found for interface {int_name} on machine {machine}. That's okay, no IPv4 will be configured")
-            else:
-                # Validate the given IP
-                try:
-                    IPv4Interface(int_vals["ipv4"])
-                except ValueError as e:
-                    logger.error(f"Unable to parse IPv4 address {int_vals['ipv4']} for machine {machine}. Parse error: {e}")
-                    self._all_ok = False
-            if "ipv6" not in int_vals:
-                logger.debug(f"No IPv6 found for interface {int_name} on machine {machine}, that's okay no IPv6 address will be configured")
-            else:
-                # Validate the given IP
-                try:
-                    IPv6Interface(int_vals["ipv6"])
-                except ValueError as e:
-                    logger.error(f"Unable to parse IPv6 address {int_vals['ipv6']} for machine {machine}. Parse error: {e}")
-                    self._all_ok = False
-            if "mac" not in int_vals:
-                logger.debug(f"MAC not found for interface {int_name} on machine {machine}, generating a random one")
-                self._new_config["machines"][machine]["interfaces"][int_name]["mac"] = random_mac_generator()
-            # From: https://stackoverflow.com/a/7629690/8632038
-            elif not fullmatch(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$", int_vals["mac"]):
-                logger.error(
-                    f"MAC {int_vals['mac']} for interface {int_name} on machine {machine}, does not seem to be valid{self.default_message}"
-                )
-                self._all_ok = False
-            if "bridge" not in int_vals:
-                logger.error(f"bridge keyword missing on interface {int_name} for machine {machine}{self.default_message}")
-                self._all_ok = False
-            elif not isinstance(int_vals["bridge"], int) or int_vals["bridge"] > self.config["switches"] - 1:
-                logger.error(
-                    f"Invalid bridge number detected for interface {int_name} on machine {machine}. "
-                    "The bridge keyword should correspond to the interface number of the vnet bridge to connect to "
-                    "(starting at iface number 0)"
-                )
-                self._all_ok = False
-            if "routes" in int_vals:
-                if not isinstance(int_vals["routes"], list):
-                    logger.error(
-                        f"routes passed to interface {int_name} for machine {machine}, "
-                        f"found type {type(int_vals['routes']).__name__}, expected type 'list'{self.default_message}"
-                    )
-                    self._all_ok = False
-                else:
-                    self.validate_interface_routes(int_vals["routes"], int_name, machine)
+        self._all_ok &= _validate_interface_config(
+            self.config, self._errors, self._mut, machine, self.validate_interface_routes, self._mutate_defaults
+        )
 
     def validate_interface_routes(self, routes: list, int_name: str, machine: str):
-        for idx, route in enumerate(routes):
-            if "to" not in route:
-                logger.error(
-                    f"'to' keyword missing from route {idx + 1} on interface {int_name} for machine {machine}{self.default_message}"
-                )
-                self._all_ok = False
-            else:
-                try:
-                    ip_network(route["to"])
-                except ValueError:
-                    if route["to"] == "default":
-                        logger.debug(
-                            f"Updating 'default' to destination for route {idx + 1} on interface {int_name} for machine "
-                            f"{machine} to 0.0.0.0/0 for backwards compatibility"
-                        )
-                        self._new_config["machines"][machine]["interfaces"][int_name]["routes"][idx]["to"] = "0.0.0.0/0"
-                    else:
-                        logger.error(
-                            f"Invalid 'to' value {route['to']} for route {idx + 1} on interface {int_name} "
-                            f"for machine {machine}{self.default_message}"
-                        )
-                        self._all_ok = False
-            if "via" not in route:
-                logger.error(
-                    f"'via' keyword missing from route {idx + 1} on interface {int_name} for machine {machine}{self.default_message}"
-                )
-                self._all_ok = False
-            else:
-                try:
-                    ip_address(route["via"])
-                except ValueError:
-                    logger.error(
-                        f"Invalid 'via' value {route['via']} (not an IP address) for route {idx + 1} on interface {int_name} "
-                        f"for machine {machine}{self.default_message}"
-                    )
-                    self._all_ok = False
+        self._all_ok &= _validate_interface_routes(self._errors, self._mut, routes, int_name, machine, self._mutate_defaults)
 
     def validate_machine_bridge_config(self, machine: str):
-        bridges = self.config["machines"][machine]["bridges"]
-        for br_name, br_vals in bridges.items():
-            if "ipv4" not in br_vals:
-                logger.debug(f"Bridge {br_name} on machine {machine} has no IPv4 assigned, that's okay")
-            else:
-                # Validate the given IP
-                try:
-                    IPv4Interface(br_vals["ipv4"])
-                except ValueError as e:
-                    logger.error(f"Unable to parse IPv4 address for bridge {br_name} on machine {machine}, got error: {e}")
-                    self._all_ok = False
-            if "ipv6" not in br_vals:
-                logger.debug(f"Bridge {br_name} on machine {machine} has no IPv6 address, that's okay")
-            else:
-                try:
-                    # Validate the IPv6 address
-                    IPv6Interface(br_vals["ipv6"])
-                except ValueError as e:
-                    logger.error(f"Unable to parse IPv6 address for bridge {br_name} on machine {machine}, got error: {e}")
-                    self._all_ok = False
-            if "slaves" not in br_vals:
-                logger.error(f"Bridge {br_name} on machine {machine} does not have any slaves")
-                self._all_ok = False
-            elif not isinstance(br_vals["slaves"], list):
-                logger.error(f"Slaves on bridge {br_name} for machine {machine}, is not formatted as a list")
-                self._all_ok = False
-            else:
-                # For each slave, check if the interface exists
-                for slave in br_vals["slaves"]:
-                    if slave not in self.config["machines"][machine]["interfaces"].keys():
-                        logger.error(f"Undefined slave interface {slave} assigned to bridge {br_name} on machine {machine}")
-                        self._all_ok = False
+        self._all_ok &= _validate_machine_bridge_config(self.config, self._errors, machine)
 
     def validate_veth_config(self):
         """
         Validates the veth config if present
         """
-        if "veths" not in self.config:
-            logger.warning("Tried to validate veth config, but no veth config present, skipping...")
-            return
-        if not isinstance(self.config["veths"], dict):
-            logger.error(f"Config item: 'veths' does not seem to be a dict {self.default_message}")
-            self._all_ok = False
-            return
-        for name, values in self.config["veths"].items():
-            if not isinstance(name, str):
-                logger.error(f"veth interface name: {name} does not seem to be a string{self.default_message}")
-                self._all_ok = False
-            elif not isinstance(values, dict):
-                logger.error(f"veth interface {name} data does not seem to be a dict{self.default_message}")
-                self._all_ok = False
-            else:
-                if "bridge" not in values:
-                    logger.error(f"veth interface {name} is missing the bridge parameter{self.default_message}")
-                    self._all_ok = False
-                elif not isinstance(values["bridge"], str):
-                    logger.error(f"veth interface {name} bridge parameter does not seem to be a str{self.default_message}")
-                    self._all_ok = False
-                if "peer" not in values:
-                    logger.debug(f"veth interface {name} does not have a peer, that's ok, assuming it's peer is defined elsewhere")
-                elif not isinstance(values["peer"], str):
-                    logger.error(f"veth interface {name} peer parameter does not seem to be a string{self.default_message}")
-                    self._all_ok = False
-                if "stp" not in values:
-                    logger.debug(f"veth interface {name} as no STP parameter, that's okay")
-                elif not isinstance(values["stp"], bool):
-                    logger.error(f"veth interface {name} stp parameter does not seem to be a boolean{self.default_message}")
-                    self._all_ok = False
+        self._all_ok &= _validate_veth_config(self.config, self._errors)
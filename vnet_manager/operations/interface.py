@@ -1,10 +1,13 @@
 import shlex
-from typing import List
+from typing import List, Tuple
+from atexit import register as atexit_register
+from functools import lru_cache
 from logging import getLogger
-from subprocess import check_call, CalledProcessError, Popen, DEVNULL
+from subprocess import check_output, run, CalledProcessError, Popen
 from os.path import join
 from pyroute2.iproute import IPRoute
 from pyroute2.ndb.main import NDB
+from pyroute2.netlink.exceptions import NetlinkError
 from psutil import process_iter
 from tabulate import tabulate
 
@@ -13,6 +16,46 @@ from vnet_manager.utils.mac import random_mac_generator
 
 logger = getLogger(__name__)
 
+_IPR = None
+
+
+def _get_ipr() -> IPRoute:
+    """
+    Returns the shared IPRoute instance, creating it on first use
+    Reusing one instance avoids opening a new netlink socket for every operation
+    :return: IPRoute: The shared instance
+    """
+    global _IPR  # pylint: disable=global-statement
+    if _IPR is None:
+        _IPR = IPRoute()
+        atexit_register(_IPR.close)
+    return _IPR
+
+
+def _get_link_index(ifname: str):
+    """
+    Resolves an interface name to its link index with a kernel-side filtered get
+    Avoids link_lookup, which dumps every interface and filters in Python
+    :param str ifname: The interface name to resolve
+    :return: int or None: The link index, or None if the interface does not exist
+    """
+    try:
+        return _get_ipr().link("get", ifname=ifname)[0]["index"]
+    except NetlinkError:
+        return None
+
+
+@lru_cache(maxsize=4)
+def _vnet_interface_names(bridge_name: str, switches: int) -> Tuple[str, ...]:
+    """
+    Builds the VNet interface names for a bridge name and switch count
+    Cached, the names only depend on these two values so repeated callers get the same tuple back
+    :param str bridge_name: The VNet bridge name prefix
+    :param int switches: The number of switches in the config
+    :return: tuple: The VNet interface names
+    """
+    return tuple(bridge_name + str(i) for i in range(0, switches))
+
 
 def get_vnet_interface_names_from_config(config: dict) -> List[str]:
     """
@@ -20,7 +63,11 @@ def get_vnet_interface_names_from_config(config: dict) -> List[str]:
     :param dict config: The conifg generated by get_config()
     :return: list: The VNet interface names
     """
-    return [settings.VNET_BRIDGE_NAME + str(i) for i in range(0, config["switches"])]
+    return list(_vnet_interface_names(settings.VNET_BRIDGE_NAME, config["switches"]))
+
+
+# Allows callers (and tests) to invalidate the cached names without knowing about the helper
+get_vnet_interface_names_from_config.cache_clear = _vnet_interface_names.cache_clear
 
 
 def get_machines_by_vnet_interface_name(config: dict, ifname: str) -> List[str]:
@@ -46,12 +93,10 @@ def show_vnet_interface_status(config: dict):
     logger.info("Listing VNet interface statuses")
     header = ["Name", "Status", "L2_addr", "Sniffer", "STP", "Used by"]
     statuses = []
-    ip = IPRoute()
     ndb = NDB(log=False)
     for ifname in get_vnet_interface_names_from_config(config):
         used_by = get_machines_by_vnet_interface_name(config, ifname)
-        dev = ip.link_lookup(ifname=ifname)
-        if not dev:
+        if _get_link_index(ifname) is None:
             # Link does not exist
             statuses.append([ifname, "NA", "NA", "NA", "NA", ", ".join(used_by)])
         else:
@@ -71,22 +116,23 @@ def show_vnet_veth_interface_status(config: dict):
     logger.info("Listing VNet veth interface statuses")
     header = ["Name", "Status", "L2_addr", "Peer", "Master"]
     statuses = []
-    ip = IPRoute()
+    # Dump all links in a single netlink call, instead of a lookup plus extra get calls per veth
+    by_ifname = {}
+    by_index = {}
+    for link in _get_ipr().get_links():
+        attrs = dict(link["attrs"])
+        by_ifname[attrs["IFLA_IFNAME"]] = (link, attrs)
+        by_index[link["index"]] = attrs
     for name, data in config["veths"].items():
-        dev = ip.link_lookup(ifname=name)
-        if not dev:
+        if name not in by_ifname:
             # Link does not exist
             statuses.append([name, "NA", "NA", "NA", data["bridge"]])
         else:
-            # Get the link info
-            info = ip.link("get", index=dev[0])
-            state = info[0]["state"]
-            l2_addr = [attr[1] for attr in info[0]["attrs"] if attr[0] == "IFLA_ADDRESS"][0]
-            peer_id = [attr[1] for attr in info[0]["attrs"] if attr[0] == "IFLA_LINK"][0]
-            peer_name = [attr[1] for attr in ip.link("get", index=peer_id)[0]["attrs"] if attr[0] == "IFLA_IFNAME"][0]
-            master_id = [attr[1] for attr in info[0]["attrs"] if attr[0] == "IFLA_MASTER"][0]
-            master_name = [attr[1] for attr in ip.link("get", index=master_id)[0]["attrs"] if attr[0] == "IFLA_IFNAME"][0]
-            statuses.append([name, state, l2_addr, peer_name, master_name])
+            # Resolve the peer and master names locally from the dump
+            link, attrs = by_ifname[name]
+            peer_name = by_index[attrs["IFLA_LINK"]]["IFLA_IFNAME"]
+            master_name = by_index[attrs["IFLA_MASTER"]]["IFLA_IFNAME"]
+            statuses.append([name, link["state"], attrs["IFLA_ADDRESS"], peer_name, master_name])
     print(tabulate(statuses, headers=header, tablefmt="pretty"))
 
 
@@ -96,7 +142,7 @@ def check_if_interface_exists(ifname: str) -> bool:
     :param str ifname: The interface name to check for
     :return: bool: True if the interface exists, False otherwise
     """
-    return bool(IPRoute().link_lookup(ifname=ifname))
+    return _get_link_index(ifname) is not None
 
 
 def create_vnet_interface(ifname: str):
@@ -105,7 +151,7 @@ def create_vnet_interface(ifname: str):
     :param str ifname: The name of the interface to create
     """
     logger.info(f"Creating VNet bridge interface {ifname}")
-    IPRoute().link("add", ifname=ifname, kind="bridge")
+    _get_ipr().link("add", ifname=ifname, kind="bridge")
     # Bring up the interface
     configure_vnet_interface(ifname)
 
@@ -118,7 +164,7 @@ def create_veth_interface(name: str, data: dict):
     """
     # We only create the interface if it has a peer
     if "peer" in data:
-        IPRoute().link("add", ifname=name, kind="veth", peer=data["peer"])
+        _get_ipr().link("add", ifname=name, kind="veth", peer=data["peer"])
 
 
 def create_vnet_interface_iptables_rules(ifname: str):
@@ -127,17 +173,37 @@ def create_vnet_interface_iptables_rules(ifname: str):
     So this function makes some IPtables rules to make sure the VNet interface cannot talk to the outside.
     :param str ifname: The interface the create IPtables rules for
     """
-    rule = f"OUTPUT -o {ifname} -j DROP"
-    # First we check if the rule already exists
+    create_vnet_interface_iptables_rules_bulk([ifname])
+
+
+def create_vnet_interface_iptables_rules_bulk(ifnames: List[str]):
+    """
+    Creates the IPtables DROP rules for multiple VNet interfaces at once
+    One iptables-save lists the existing rules and one iptables-restore appends all missing ones,
+    instead of forking iptables twice per interface
+    :param list ifnames: The interfaces to create IPtables rules for
+    """
+    # First we check which rules already exist
     try:
-        check_call(shlex.split(f"iptables -C {rule}"), stderr=DEVNULL)
-        logger.debug(f"IPtables DROP rule for VNet interface {ifname} already exists, skipping creation")
-    except CalledProcessError:
-        logger.info(f"Creating IPtables DROP rule to the outside world for VNet interface {ifname}")
-        try:
-            check_call(shlex.split(f"iptables -A {rule}"))
-        except CalledProcessError as e:
-            logger.error(f"Unable to create IPtables rule, got output: {e.output}")
+        existing_rules = check_output(shlex.split("iptables-save -t filter")).decode()
+    except CalledProcessError as e:
+        logger.error(f"Unable to list the existing IPtables rules, got output: {e.output}")
+        return
+    missing_rules = []
+    for ifname in ifnames:
+        rule = f"-A OUTPUT -o {ifname} -j DROP"
+        if rule in existing_rules:
+            logger.debug(f"IPtables DROP rule for VNet interface {ifname} already exists, skipping creation")
+        else:
+            logger.info(f"Creating IPtables DROP rule to the outside world for VNet interface {ifname}")
+            missing_rules.append(rule)
+    if not missing_rules:
+        return
+    script = "*filter\n" + "\n".join(missing_rules) + "\nCOMMIT\n"
+    try:
+        run(shlex.split("iptables-restore --noflush"), input=script.encode(), check=True)
+    except CalledProcessError as e:
+        logger.error(f"Unable to create IPtables rules, got output: {e.output}")
 
 
 def configure_vnet_interface(ifname: str):
@@ -145,8 +211,8 @@ def configure_vnet_interface(ifname: str):
     Configures an vnet interface to be in the correct state for forwarding vnet machine traffic
     :param str ifname: The vnet interface to configure
     """
-    ip = IPRoute()
-    dev = ip.link_lookup(ifname=ifname)[0]
+    ip = _get_ipr()
+    dev = _get_link_index(ifname)
     # Make sure it's set to down state
     ip.link("set", index=dev, state="down")
     # Set the mac
@@ -162,11 +228,10 @@ def configure_veth_interface(name: str, data: dict):
     :param dict data: The veth interface data (bridge name)
     """
     logger.info(f"Creating VNet veth interface {name}")
-    ip = IPRoute()
-    dev = ip.link_lookup(ifname=name)[0]
-    bridge = ip.link_lookup(ifname=data["bridge"])[0]
+    dev = _get_link_index(name)
+    bridge = _get_link_index(data["bridge"])
     # Connect the veth interface to the bridge
-    ip.link("set", index=dev, master=bridge)
+    _get_ipr().link("set", index=dev, master=bridge)
 
 
 def bring_up_vnet_interfaces(config: dict, sniffer: bool = False, pcap_dir: str = settings.VNET_SNIFFER_PCAP_DIR):
@@ -175,17 +240,18 @@ def bring_up_vnet_interfaces(config: dict, sniffer: bool = False, pcap_dir: str
     :param dict config: The config generated by get_config()
     :param bool sniffer: Check for a sniffer process and create it if it does not exist
     """
-    ip = IPRoute()
-    for ifname in get_vnet_interface_names_from_config(config):
+    ip = _get_ipr()
+    interfaces = get_vnet_interface_names_from_config(config)
+    for ifname in interfaces:
         if not check_if_interface_exists(ifname):
             create_vnet_interface(ifname)
-        # Block traffic to the outside world
-        create_vnet_interface_iptables_rules(ifname)
         # Make sure the interface is up
         ip.link("set", ifname=ifname, state="up")
         if sniffer and not check_if_sniffer_exists(ifname):
             # Create it
             start_tcpdump_on_vnet_interface(ifname=ifname, path=pcap_dir)
+    # Block traffic to the outside world, for all interfaces in one go
+    create_vnet_interface_iptables_rules_bulk(interfaces)
     if "veths" in config:
         ensure_vnet_veth_interfaces(config)
 
@@ -232,7 +298,7 @@ def bring_down_vnet_interfaces(config: dict):
     This will automatically kill any attached sniffer processes
     :param dict config: The config generated by get_config()
     """
-    ip = IPRoute()
+    ip = _get_ipr()
     if "veths" in config:
         for name in config["veths"].keys():
             if check_if_interface_exists(name):
@@ -253,7 +319,7 @@ def delete_vnet_interfaces(config: dict):
     Delete the VNet interfaces defined in the config
     :param config:
     """
-    ip = IPRoute()
+    ip = _get_ipr()
     if "veths" in config:
         for name, data in config["veths"].items():
             # Veth interfaces are deleted in pairs, so we only delete the ones with a peer
@@ -27,6 +27,40 @@ class VNetTestCase(TestCase):
         self.addCleanup(patcher.stop)
         return patcher.start()
 
+    @classmethod
+    def set_up_class_patch(cls, topatch, themock=None, **kwargs):
+        """
+        Patch a function or class once for the whole test class, instead of per test
+        The mock is shared between the tests, so reset it (and re-apply any return values) in setUp
+        :param topatch: string The class to patch
+        :param themock: optional object to use as mock
+        :return: mocked object
+        """
+        if themock is None:
+            themock = mock.Mock()
+
+        if "return_value" in kwargs:
+            themock.return_value = kwargs["return_value"]
+
+        patcher = mock.patch(topatch, themock)
+        cls.addClassCleanup(patcher.stop)
+        return patcher.start()
+
+    @classmethod
+    def set_up_class_patches(cls, module, **mocks):
+        """
+        Patch multiple attributes of one module for the duration of the test class, with a single patcher
+        The mocks are shared between the tests, so reset them (and re-apply any return values) in setUp
+        :param str module: The module whose attributes to patch
+        :param mocks: The attribute names to patch, mapped to the mocks to use (None for a plain Mock)
+        :return: dict: The mocks by attribute name
+        """
+        mocks = {name: themock if themock is not None else mock.Mock() for name, themock in mocks.items()}
+        patcher = mock.patch.multiple(module, **mocks)
+        cls.addClassCleanup(patcher.stop)
+        patcher.start()
+        return mocks
+
     def set_up_context_manager_patch(self, topatch, themock=None, **kwargs):
         """
         Provides a mock object which can be used with context managers (like with statements)
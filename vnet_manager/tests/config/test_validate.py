@@ -8,7 +8,7 @@ from vnet_manager.conf import settings
 
 class TestValidateConfigClass(VNetTestCase):
     def setUp(self) -> None:
-        self.validator = ValidateConfig(deepcopy(settings.CONFIG))
+        self.validator = ValidateConfig(deepcopy(settings.CONFIG), disable_cache=True)
         self.switch_config = Mock()
         self.validator.validate_switch_config = self.switch_config
         self.machine_config = Mock()
@@ -42,6 +42,39 @@ class TestValidateConfigClass(VNetTestCase):
         self.validator.validate()
         self.veth_config.assert_called_once_with()
 
+    def test_validate_function_uses_cached_result_for_previously_validated_config(self):
+        self.addCleanup(ValidateConfig.clear_result_cache)
+        cached_validator = ValidateConfig(deepcopy(settings.CONFIG))
+        cached_validator.validate_switch_config = Mock()
+        cached_validator.validate_machine_config = Mock()
+        cached_validator.validate_veth_config = Mock()
+        cached_validator.validate()
+        second_validator = ValidateConfig(deepcopy(settings.CONFIG))
+        second_validator.validate_machine_config = Mock()
+        second_validator.validate()
+        self.assertFalse(second_validator.validate_machine_config.called)
+        self.assertTrue(second_validator.config_validation_successful)
+
+    def test_validate_function_restores_validators_ran_on_cache_hit(self):
+        self.addCleanup(ValidateConfig.clear_result_cache)
+        # Use VALIDATED_CONFIG so we have the config_dir
+        cached_validator = ValidateConfig(deepcopy(settings.VALIDATED_CONFIG))
+        cached_validator.validate()
+        second_validator = ValidateConfig(deepcopy(settings.VALIDATED_CONFIG))
+        second_validator.validate()
+        self.assertGreater(second_validator.validators_ran, 0)
+        self.assertEqual(second_validator.validators_ran, cached_validator.validators_ran)
+
+    def test_validate_function_revalidates_identical_config_when_cache_disabled(self):
+        self.addCleanup(ValidateConfig.clear_result_cache)
+        cached_validator = ValidateConfig(deepcopy(settings.CONFIG))
+        cached_validator.validate_switch_config = Mock()
+        cached_validator.validate_machine_config = Mock()
+        cached_validator.validate_veth_config = Mock()
+        cached_validator.validate()
+        self.validator.validate()
+        self.machine_config.assert_called_once_with()
+
 
 class TestValidateConfigValidateSwitchConfig(VNetTestCase):
     def setUp(self) -> None:
@@ -57,15 +90,14 @@ class TestValidateConfigValidateSwitchConfig(VNetTestCase):
         del self.validator.config["switches"]
         self.validator.validate_switch_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(f"Config item 'switches' missing{self.validator.default_message}")
+        self.assertEqual(self.validator.errors, ["Config item 'switches' missing. Please check your settings"])
 
     def test_validate_switch_config_fails_when_switch_config_not_a_int(self):
         self.validator.config["switches"] = "os3"
         self.validator.validate_switch_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"Config item 'switches: {self.validator.config['switches']}' does not seem to be an integer{self.validator.default_message}"
-        )
+        expected = "Config item 'switches: %s' does not seem to be an integer. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % (self.validator.config["switches"],)])
 
 
 class TestValidateConfigValidateMachineConfig(VNetTestCase):
@@ -88,37 +120,36 @@ class TestValidateConfigValidateMachineConfig(VNetTestCase):
         del self.validator.config["machines"]
         self.validator.validate_machine_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(f"Config item 'machines' missing{self.validator.default_message}")
+        self.assertEqual(self.validator.errors, ["Config item 'machines' missing. Please check your settings"])
 
     def test_validate_machine_config_fails_when_machine_config_not_a_dict(self):
         self.validator.config["machines"] = 42
         self.validator.validate_machine_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"Machines config is not a dict, this means the user config is incorrect{self.validator.default_message}"
+        self.assertEqual(
+            self.validator.errors, ["Machines config is not a dict, this means the user config is incorrect. Please check your settings"]
         )
 
     def test_validate_machine_config_fails_when_machine_type_not_present(self):
         del self.validator.config["machines"]["router100"]["type"]
         self.validator.validate_machine_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(f"Type not found for machine router100{self.validator.default_message}")
+        expected = "Type not found for machine %s. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("router100",)])
 
     def test_validate_machine_config_fails_when_machine_type_not_in_supported_machine_types(self):
         self.validator.config["machines"]["router100"]["type"] = "banana"
         self.validator.validate_machine_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            "Type banana for machine router100 unsupported. I only support the following types: {}{}".format(
-                settings.SUPPORTED_MACHINE_TYPES, self.validator.default_message
-            )
-        )
+        expected = "Type %s for machine %s unsupported. I only support the following types: %s. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("banana", "router100", settings.SUPPORTED_MACHINE_TYPES)])
 
     def test_validate_machine_config_fails_when_machine_files_not_a_dict(self):
         self.validator.config["machines"]["router100"]["files"] = "banana"
         self.validator.validate_machine_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(f"Files directive for machine router100 is not a dict{self.validator.default_message}")
+        expected = "Files directive for machine %s is not a dict. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("router100",)])
 
     def test_validate_machine_config_succeeds_when_machine_files_not_present(self):
         del self.validator.config["machines"]["router100"]["files"]
@@ -137,9 +168,8 @@ class TestValidateConfigValidateMachineConfig(VNetTestCase):
         del self.validator.config["machines"]["router100"]["interfaces"]
         self.validator.validate_machine_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"Machine router100 does not appear to have any interfaces{self.validator.default_message}"
-        )
+        expected = "Machine %s does not appear to have any interfaces. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("router100",)])
 
     def test_validate_machine_config_fails_if_interfaces_is_not_a_dict(self):
         self.validator.config["machines"]["router100"]["interfaces"] = 42
@@ -147,15 +177,10 @@ class TestValidateConfigValidateMachineConfig(VNetTestCase):
         self.validator.config["machines"]["host102"]["interfaces"] = 42
         self.validator.validate_machine_config()
         self.assertFalse(self.validator.config_validation_successful)
-        calls = [
-            call(
-                "The interfaces for machine {} are not given as a dict, this usually means a typo in the config{}".format(
-                    machine, self.validator.default_message
-                )
-            )
-            for machine in self.validator.config["machines"].keys()
-        ]
-        self.logger.error.assert_has_calls(calls)
+        expected = (
+            "The interfaces for machine %s are not given as a dict, this usually means a typo in the config. Please check your settings"
+        )
+        self.assertEqual(self.validator.errors, [expected % machine for machine in self.validator.config["machines"].keys()])
         self.assertFalse(self.validate_interfaces.called)
 
     def test_validate_machine_config_calls_validate_interface_config(self):
@@ -163,6 +188,14 @@ class TestValidateConfigValidateMachineConfig(VNetTestCase):
         calls = [call(machine) for machine in self.validator.config["machines"].keys()]
         self.validate_interfaces.assert_has_calls(calls)
 
+    def test_validate_machine_config_skips_remaining_machine_checks_once_machine_known_bad(self):
+        del self.validator.config["machines"]["router100"]["type"]
+        self.validator.validate_machine_config()
+        self.assertFalse(self.validator.config_validation_successful)
+        # router100 is dropped after the type error, the other machines are still checked
+        self.assertNotIn(call("router100"), self.validate_interfaces.call_args_list)
+        self.validate_interfaces.assert_has_calls([call("router101"), call("host102")])
+
     def test_validate_machine_config_calls_validate_vlan_config_for_each_vlan_interface(self):
         # We have only one VLAN interface defined in the settings
         self.validator.validate_machine_config()
@@ -177,10 +210,11 @@ class TestValidateConfigValidateMachineConfig(VNetTestCase):
         self.validator.config["machines"]["router100"]["vlans"] = 1337
         self.validator.validate_machine_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            "Machine router100 has a VLAN config but it does not appear to be a dict, "
-            "this usually means a typo in the config{}".format(self.validator.default_message)
+        expected = (
+            "Machine %s has a VLAN config but it does not appear to be a dict, this usually means a typo in the config"
+            ". Please check your settings"
         )
+        self.assertEqual(self.validator.errors, [expected % ("router100",)])
 
     def test_validate_machine_config_does_not_call_validate_bridge_config_if_no_bridges(self):
         del self.validator.config["machines"]["router100"]["bridges"]
@@ -195,31 +229,29 @@ class TestValidateConfigValidateMachineConfig(VNetTestCase):
         self.validator.config["machines"]["router100"]["bridges"] = 1337
         self.validator.validate_machine_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once()
+        self.assertEqual(len(self.validator.errors), 1)
 
 
 class TestValidateConfigValidateMachineFilesParameters(VNetTestCase):
     def setUp(self) -> None:
         # Use VALIDATED_CONFIG so we have the config_dir
         self.validator = ValidateConfig(deepcopy(settings.VALIDATED_CONFIG))
-        self.is_dir = self.set_up_patch("vnet_manager.config.validate.isdir")
-        self.is_dir.return_value = False
-        self.is_file = self.set_up_patch("vnet_manager.config.validate.isfile")
-        self.is_file.return_value = False
+        self.path_kind = self.set_up_patch("vnet_manager.config.validate._path_kind")
+        self.path_kind.return_value = None
         self.logger = self.set_up_patch("vnet_manager.config.validate.logger")
 
     def test_validate_machine_file_parameters_fails_when_no_file_or_dir_found(self):
         self.validator.validate_machine_files_parameters("router100")
         self.assertFalse(self.validator.config_validation_successful)
-        self.assertTrue(self.logger.error.called)
+        self.assertTrue(self.validator.errors)
 
-    def test_validate_machine_file_parameters_is_ok_when_is_dir_is_true(self):
-        self.is_dir.return_value = True
+    def test_validate_machine_file_parameters_is_ok_when_path_is_a_dir(self):
+        self.path_kind.return_value = "dir"
         self.validator.validate_machine_files_parameters("router100")
         self.assertTrue(self.validator.config_validation_successful)
 
-    def test_validate_machine_file_parameters_is_ok_when_is_file_is_true(self):
-        self.is_file.return_value = True
+    def test_validate_machine_file_parameters_is_ok_when_path_is_a_file(self):
+        self.path_kind.return_value = "file"
         self.validator.validate_machine_files_parameters("router100")
         self.assertTrue(self.validator.config_validation_successful)
 
@@ -243,7 +275,13 @@ class TestValidateConfigValidateInterfaceConfig(VNetTestCase):
         self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["ipv4"] = "255.255.256.257"
         self.validator.validate_interface_config("router100")
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once()
+        self.assertEqual(len(self.validator.errors), 1)
+
+    def test_validate_interface_config_fails_when_ipv4_is_not_a_string(self):
+        self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["ipv4"] = ["192.168.0.2/24"]
+        self.validator.validate_interface_config("router100")
+        self.assertFalse(self.validator.config_validation_successful)
+        self.assertEqual(len(self.validator.errors), 1)
 
     def test_validate_interface_config_does_not_fail_when_ipv6_not_present(self):
         del self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["ipv6"]
@@ -254,43 +292,55 @@ class TestValidateConfigValidateInterfaceConfig(VNetTestCase):
         self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["ipv6"] = "2001:h80:1:2d96::f1a5/64"
         self.validator.validate_interface_config("router100")
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once()
+        self.assertEqual(len(self.validator.errors), 1)
 
     def test_validate_interface_config_fails_when_bridge_not_present(self):
         del self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["bridge"]
         self.validator.validate_interface_config("router100")
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"bridge keyword missing on interface eth12 for machine router100{self.validator.default_message}"
-        )
+        expected = "bridge keyword missing on interface %s for machine %s. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("eth12", "router100")])
 
     def test_validate_interface_config_fails_when_bridge_not_a_int(self):
         self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["bridge"] = "42"
         self.validator.validate_interface_config("router100")
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            "Invalid bridge number detected for interface eth12 on machine router100. "
+        expected = (
+            "Invalid bridge number detected for interface %s on machine %s. "
             "The bridge keyword should correspond to the interface number of the vnet bridge to connect to "
             "(starting at iface number 0)"
         )
+        self.assertEqual(self.validator.errors, [expected % ("eth12", "router100")])
 
     def test_validate_interface_config_fails_when_bridge_number_higher_then_the_amount_of_switches(self):
         self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["bridge"] = 3
         self.validator.validate_interface_config("router100")
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            "Invalid bridge number detected for interface eth12 on machine router100. "
+        expected = (
+            "Invalid bridge number detected for interface %s on machine %s. "
             "The bridge keyword should correspond to the interface number of the vnet bridge to connect to "
             "(starting at iface number 0)"
         )
+        self.assertEqual(self.validator.errors, [expected % ("eth12", "router100")])
+
+    def test_validate_interface_config_reports_invalid_bridge_when_switches_is_missing(self):
+        del self.validator.config["switches"]
+        self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["bridge"] = "42"
+        self.validator.validate_interface_config("router100")
+        self.assertFalse(self.validator.config_validation_successful)
+        expected = (
+            "Invalid bridge number detected for interface %s on machine %s. "
+            "The bridge keyword should correspond to the interface number of the vnet bridge to connect to "
+            "(starting at iface number 0)"
+        )
+        self.assertEqual(self.validator.errors, [expected % ("eth12", "router100")])
 
     def test_validate_interface_config_fails_when_routes_is_not_a_list(self):
         self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["routes"] = "blaap"
         self.validator.validate_interface_config("router100")
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"routes passed to interface eth12 for machine router100, found type str, expected type 'list'{self.validator.default_message}"
-        )
+        expected = "routes passed to interface %s for machine %s, found type %s, expected type 'list'. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("eth12", "router100", "str")])
 
     def test_validate_interface_config_calls_validate_routes_when_routes_passed_in_config(self):
         self.validator.validate_interface_config("router100")
@@ -303,6 +353,13 @@ class TestValidateConfigValidateInterfaceConfig(VNetTestCase):
         self.validator.validate_interface_config("router100")
         self.assertFalse(self.validate_routes.called)
 
+    def test_validate_interface_config_does_not_generate_mac_when_mutate_defaults_disabled(self):
+        del self.validator.config["machines"]["router100"]["interfaces"]["eth12"]["mac"]
+        validator = ValidateConfig(self.validator.config, mutate_defaults=False)
+        validator.validate_interface_config("router100")
+        self.assertTrue(validator.config_validation_successful)
+        self.assertNotIn("mac", validator.updated_config["machines"]["router100"]["interfaces"]["eth12"])
+
 
 class TestValidateInterfaceRoutes(VNetTestCase):
     def setUp(self) -> None:
@@ -314,46 +371,46 @@ class TestValidateInterfaceRoutes(VNetTestCase):
     def test_validate_routes_validates_correct_routes(self):
         self.validator.validate_interface_routes(self.routes, "eth12", self.machine)
         self.assertTrue(self.validator.config_validation_successful)
-        self.assertFalse(self.logger.error.called)
+        self.assertFalse(self.validator.errors)
 
     def test_validate_routes_fails_if_route_missing_to(self):
         del self.routes[0]["to"]
         self.validator.validate_interface_routes(self.routes, "eth12", self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"'to' keyword missing from route 1 on interface eth12 for machine {self.machine}{self.validator.default_message}"
-        )
+        expected = "'to' keyword missing from route %s on interface %s for machine %s. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % (1, "eth12", self.machine)])
 
     def test_validate_routes_fails_if_to_is_malformed(self):
         self.routes[0]["to"] = "1negen2.168.0.1"
         self.validator.validate_interface_routes(self.routes, "eth12", self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"Invalid 'to' value 1negen2.168.0.1 for route 1 on interface eth12 for machine {self.machine}{self.validator.default_message}"
-        )
+        expected = "Invalid 'to' value %s for route %s on interface %s for machine %s. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("1negen2.168.0.1", 1, "eth12", self.machine)])
 
     def test_validate_routes_fails_if_route_missing_via(self):
         del self.routes[0]["via"]
         self.validator.validate_interface_routes(self.routes, "eth12", self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"'via' keyword missing from route 1 on interface eth12 for machine {self.machine}{self.validator.default_message}"
-        )
+        expected = "'via' keyword missing from route %s on interface %s for machine %s. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % (1, "eth12", self.machine)])
 
     def test_validate_routes_fails_if_via_is_malformed(self):
         self.routes[1]["via"] = "blaap"
         self.validator.validate_interface_routes(self.routes, "eth12", self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            "Invalid 'via' value blaap (not an IP address) for route 2 on interface eth12 for machine {}{}".format(
-                self.machine, self.validator.default_message
-            )
-        )
+        expected = "Invalid 'via' value %s (not an IP address) for route %s on interface %s for machine %s. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("blaap", 2, "eth12", self.machine)])
 
     def test_validate_routes_updates_default_route_to_quad_zero(self):
         self.validator.validate_interface_routes(self.routes, "eth12", self.machine)
         self.assertEqual(self.validator.updated_config["machines"][self.machine]["interfaces"]["eth12"]["routes"][1]["to"], "0.0.0.0/0")
 
+    def test_validate_routes_does_not_update_default_route_when_mutate_defaults_disabled(self):
+        validator = ValidateConfig(deepcopy(settings.CONFIG), mutate_defaults=False)
+        validator.validate_interface_routes(self.routes, "eth12", self.machine)
+        self.assertTrue(validator.config_validation_successful)
+        self.assertEqual(validator.updated_config["machines"][self.machine]["interfaces"]["eth12"]["routes"][1]["to"], "default")
+
 
 class TestValidateConfigValidateVethConfig(VNetTestCase):
     def setUp(self) -> None:
@@ -370,53 +427,49 @@ class TestValidateConfigValidateVethConfig(VNetTestCase):
         self.validator.config["veths"] = 42
         self.validator.validate_veth_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(f"Config item: 'veths' does not seem to be a dict {self.validator.default_message}")
+        self.assertEqual(self.validator.errors, ["Config item: 'veths' does not seem to be a dict . Please check your settings"])
 
     def test_validate_veth_config_fails_when_veth_config_name_if_not_a_string(self):
         self.validator.config["veths"][42] = self.validator.config["veths"].pop("vnet-veth1")
         self.validator.validate_veth_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(f"veth interface name: 42 does not seem to be a string{self.validator.default_message}")
+        expected = "veth interface name: %s does not seem to be a string. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % (42,)])
 
     def test_validate_veth_config_fails_when_veth_config_values_if_not_a_dict(self):
         self.validator.config["veths"]["vnet-veth1"] = "blaap"
         self.validator.validate_veth_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"veth interface vnet-veth1 data does not seem to be a dict{self.validator.default_message}"
-        )
+        expected = "veth interface %s data does not seem to be a dict. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("vnet-veth1",)])
 
     def test_validate_veth_config_fails_when_veth_config_parameter_bridge_missing(self):
         del self.validator.config["veths"]["vnet-veth1"]["bridge"]
         self.validator.validate_veth_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"veth interface vnet-veth1 is missing the bridge parameter{self.validator.default_message}"
-        )
+        expected = "veth interface %s is missing the bridge parameter. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("vnet-veth1",)])
 
     def test_validate_veth_config_fails_when_veth_config_parameter_bridge_is_not_a_string(self):
         self.validator.config["veths"]["vnet-veth1"]["bridge"] = 42
         self.validator.validate_veth_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"veth interface vnet-veth1 bridge parameter does not seem to be a str{self.validator.default_message}"
-        )
+        expected = "veth interface %s bridge parameter does not seem to be a str. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("vnet-veth1",)])
 
     def test_validate_veth_config_fails_when_veth_config_parameter_peer_is_not_a_string(self):
         self.validator.config["veths"]["vnet-veth1"]["peer"] = 42
         self.validator.validate_veth_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"veth interface vnet-veth1 peer parameter does not seem to be a string{self.validator.default_message}"
-        )
+        expected = "veth interface %s peer parameter does not seem to be a string. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("vnet-veth1",)])
 
     def test_validate_veth_config_fails_when_veth_config_parameter_stp_is_not_a_bool(self):
         self.validator.config["veths"]["vnet-veth1"]["stp"] = "42"
         self.validator.validate_veth_config()
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"veth interface vnet-veth1 stp parameter does not seem to be a boolean{self.validator.default_message}"
-        )
+        expected = "veth interface %s stp parameter does not seem to be a boolean. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("vnet-veth1",)])
 
 
 class TestValidateConfigValidateVLANConfig(VNetTestCase):
@@ -433,48 +486,41 @@ class TestValidateConfigValidateVLANConfig(VNetTestCase):
         del self.validator.config["machines"][self.machine]["vlans"]["vlan.100"]["id"]
         self.validator.validate_vlan_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"VLAN vlan.100 on machine {self.machine} is missing it's vlan id{self.validator.default_message}"
-        )
+        expected = "VLAN %s on machine %s is missing it's vlan id. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("vlan.100", self.machine)])
 
     def test_validate_vlan_config_fails_if_id_is_not_castable_to_int(self):
         self.validator.config["machines"][self.machine]["vlans"]["vlan.100"]["id"] = "banaan"
         self.validator.validate_vlan_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"Unable to cast VLAN vlan.100 with ID banaan from machine {self.machine} to a integer{self.validator.default_message}"
-        )
+        expected = "Unable to cast VLAN %s with ID %s from machine %s to a integer. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("vlan.100", "banaan", self.machine)])
 
     def test_validate_vlan_config_fails_if_link_is_not_present(self):
         del self.validator.config["machines"][self.machine]["vlans"]["vlan.100"]["link"]
         self.validator.validate_vlan_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"VLAN vlan.100 on machine {self.machine} is missing it's link attribute{self.validator.default_message}"
-        )
+        expected = "VLAN %s on machine %s is missing it's link attribute. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("vlan.100", self.machine)])
 
     def test_validate_vlan_config_fails_if_link_is_not_a_string(self):
         self.validator.config["machines"][self.machine]["vlans"]["vlan.100"]["link"] = 42
         self.validator.validate_vlan_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            f"Link 42 for VLAN vlan.100 on machine {self.machine}, does not seem to be a string{self.validator.default_message}"
-        )
+        expected = "Link %s for VLAN %s on machine %s, does not seem to be a string. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % (42, "vlan.100", self.machine)])
 
     def test_validate_vlan_config_fails_if_link_is_not_found_in_machine_interfaces(self):
         self.validator.config["machines"][self.machine]["vlans"]["vlan.100"]["link"] = "eth1337"
         self.validator.validate_vlan_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(
-            "Link eth1337 for VLAN vlan.100 on machine {} does not correspond to any interfaces on "
-            "the same machine{}".format(self.machine, self.validator.default_message)
-        )
+        expected = "Link %s for VLAN %s on machine %s does not correspond to any interfaces on the same machine. Please check your settings"
+        self.assertEqual(self.validator.errors, [expected % ("eth1337", "vlan.100", self.machine)])
 
-    def test_validate_vlan_config_does_not_check_link_in_interfaces_if_config_validation_already_failed(self):
-        self.validator._all_ok = False
+    def test_validate_vlan_config_does_not_check_link_in_interfaces_if_machine_validation_already_failed(self):
         self.validator.config["machines"][self.machine]["vlans"]["vlan.100"]["link"] = "eth1337"
-        self.validator.validate_vlan_config(self.machine)
-        self.assertFalse(self.logger.error.called)
+        self.validator.validate_vlan_config(self.machine, machine_ok=False)
+        self.assertFalse(self.validator.errors)
 
     def test_validate_vlan_config_does_not_fail_if_addresses_not_in_values(self):
         del self.validator.config["machines"][self.machine]["vlans"]["vlan.100"]["addresses"]
@@ -485,7 +531,7 @@ class TestValidateConfigValidateVLANConfig(VNetTestCase):
         self.validator.config["machines"][self.machine]["vlans"]["vlan.100"]["addresses"].append("banaan")
         self.validator.validate_vlan_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.assertTrue(self.logger.error.call_args_list[0].startswith(f"Address banaan for VLAN vlan.100 on machine {self.machine}"))
+        self.assertTrue(self.validator.errors[0].startswith(f"Address banaan for VLAN vlan.100 on machine {self.machine}"))
 
 
 class TestValidateConfigValidateMachineBridgeConfig(VNetTestCase):
@@ -512,29 +558,32 @@ class TestValidateConfigValidateMachineBridgeConfig(VNetTestCase):
         self.validator.config["machines"][self.machine]["bridges"]["br1"]["ipv4"] = "blaap"
         self.validator.validate_machine_bridge_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once()
+        self.assertEqual(len(self.validator.errors), 1)
 
     def test_validate_machine_bridge_config_fails_if_incorrect_ipv6(self):
         self.validator.config["machines"][self.machine]["bridges"]["br1"]["ipv6"] = "blaap"
         self.validator.validate_machine_bridge_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once()
+        self.assertEqual(len(self.validator.errors), 1)
 
     def test_validate_machine_bridge_config_fails_if_slaves_not_in_bridge_params(self):
         del self.validator.config["machines"][self.machine]["bridges"]["br1"]["slaves"]
         self.validator.validate_machine_bridge_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(f"Bridge br1 on machine {self.machine} does not have any slaves")
+        expected = "Bridge %s on machine %s does not have any slaves"
+        self.assertEqual(self.validator.errors, [expected % ("br1", self.machine)])
 
     def test_validate_machine_bridge_config_fails_if_slaves_param_is_not_a_list(self):
         self.validator.config["machines"][self.machine]["bridges"]["br1"]["slaves"] = "blaap"
         self.validator.validate_machine_bridge_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(f"Slaves on bridge br1 for machine {self.machine}, is not formatted as a list")
+        expected = "Slaves on bridge %s for machine %s, is not formatted as a list"
+        self.assertEqual(self.validator.errors, [expected % ("br1", self.machine)])
 
     def test_validate_machine_bridge_config_fails_if_slave_not_present_in_interfaces_config(self):
         iface = "blaap1"
         self.validator.config["machines"][self.machine]["bridges"]["br1"]["slaves"].append(iface)
         self.validator.validate_machine_bridge_config(self.machine)
         self.assertFalse(self.validator.config_validation_successful)
-        self.logger.error.assert_called_once_with(f"Undefined slave interface {iface} assigned to bridge br1 on machine {self.machine}")
+        expected = "Undefined slave interface %s assigned to bridge %s on machine %s"
+        self.assertEqual(self.validator.errors, [expected % (iface, "br1", self.machine)])
@@ -1,8 +1,9 @@
 import shlex
 from os.path import join
-from subprocess import DEVNULL, CalledProcessError
-from unittest.mock import Mock, MagicMock, ANY, call
+from subprocess import CalledProcessError
+from unittest.mock import Mock, MagicMock, ANY, call, patch
 from copy import deepcopy
+from pyroute2.netlink.exceptions import NetlinkError
 
 from vnet_manager.tests import VNetTestCase
 from vnet_manager.operations.interface import (
@@ -14,6 +15,7 @@ from vnet_manager.operations.interface import (
     create_vnet_interface,
     create_veth_interface,
     create_vnet_interface_iptables_rules,
+    create_vnet_interface_iptables_rules_bulk,
     configure_vnet_interface,
     configure_veth_interface,
     bring_up_vnet_interfaces,
@@ -25,74 +27,115 @@ from vnet_manager.operations.interface import (
 )
 from vnet_manager.conf import settings
 
+# Bound once at import, so the tests do not go through the lazy settings resolution on every access
+CONFIG = settings.CONFIG
+VETHS = CONFIG["veths"]
+BRIDGE_NAME = settings.VNET_BRIDGE_NAME
+
+
+class TestGetIPR(VNetTestCase):
+    def setUp(self) -> None:
+        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
+        self.iproute.return_value.link.return_value = [{"index": 1}]
+        self.atexit_register = self.set_up_patch("vnet_manager.operations.interface.atexit_register")
+        patcher = patch("vnet_manager.operations.interface._IPR", None)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def test_get_ipr_creates_the_iproute_instance_only_once(self):
+        check_if_interface_exists("dev1")
+        check_if_interface_exists("dev1")
+        self.iproute.assert_called_once_with()
+
+    def test_get_ipr_registers_the_instance_close_at_exit(self):
+        check_if_interface_exists("dev1")
+        self.atexit_register.assert_called_once_with(self.iproute.return_value.close)
+
 
 class TestGetVNetInterfaceNamesFromConfig(VNetTestCase):
+    def setUp(self) -> None:
+        get_vnet_interface_names_from_config.cache_clear()
+        self.addCleanup(get_vnet_interface_names_from_config.cache_clear)
+
     def test_get_vnet_interface_names_from_config_returns_a_list(self):
-        self.assertIsInstance(get_vnet_interface_names_from_config(settings.CONFIG), list)
+        self.assertIsInstance(get_vnet_interface_names_from_config(CONFIG), list)
 
     def test_get_vnet_interface_names_from_config_is_equal_to_the_length_of_defined_switches(self):
-        self.assertEqual(len(get_vnet_interface_names_from_config(settings.CONFIG)), settings.CONFIG["switches"])
+        self.assertEqual(len(get_vnet_interface_names_from_config(CONFIG)), CONFIG["switches"])
 
     def test_get_vnet_interface_names_from_config_startswith_vnet_bridge_name(self):
-        for interface in get_vnet_interface_names_from_config(settings.CONFIG):
-            self.assertRegex(interface, r"^{}".format(settings.VNET_BRIDGE_NAME))
+        for interface in get_vnet_interface_names_from_config(CONFIG):
+            self.assertRegex(interface, rf"^{BRIDGE_NAME}")
 
 
 class TestGetMachinesByVNetInterfaceName(VNetTestCase):
     def test_get_machines_by_vnet_interface_name_returns_a_list(self):
-        self.assertIsInstance(get_vnet_interface_names_from_config(settings.CONFIG), list)
+        self.assertIsInstance(get_vnet_interface_names_from_config(CONFIG), list)
 
     def test_get_machines_by_vnet_interface_name_returns_the_correct_machines_per_interface(self):
         interface_mapping = {
-            settings.VNET_BRIDGE_NAME + "0": ["router100", "router101"],
-            settings.VNET_BRIDGE_NAME + "1": ["router101", "host102"],
+            BRIDGE_NAME + "0": ["router100", "router101"],
+            BRIDGE_NAME + "1": ["router101", "host102"],
         }
-        for interface in interface_mapping:
-            self.assertEqual(get_machines_by_vnet_interface_name(settings.CONFIG, interface), interface_mapping[interface])
+        for interface, machines in interface_mapping.items():
+            self.assertEqual(get_machines_by_vnet_interface_name(CONFIG, interface), machines)
 
 
 class TestShowVNetInterfaceStatus(VNetTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        mocks = cls.set_up_class_patches(
+            "vnet_manager.operations.interface",
+            _get_ipr=None,
+            NDB=MagicMock(),
+            check_if_sniffer_exists=None,
+            tabulate=None,
+            get_vnet_interface_names_from_config=None,
+        )
+        cls.iproute = mocks["_get_ipr"]
+        cls.ndb = mocks["NDB"]
+        cls.check_if_sniffer_exists = mocks["check_if_sniffer_exists"]
+        cls.tabulate = mocks["tabulate"]
+        cls.interfaces = mocks["get_vnet_interface_names_from_config"]
+
     def setUp(self) -> None:
+        for shared_mock in (self.iproute, self.ndb, self.check_if_sniffer_exists, self.tabulate, self.interfaces):
+            shared_mock.reset_mock(return_value=True, side_effect=True)
         self.iproute_obj = Mock()
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
         self.iproute.return_value = self.iproute_obj
-        self.iproute_obj.link_lookup.return_value = "dev1"
-        self.ndb_obj = MagicMock()
-        self.ndb = self.set_up_patch("vnet_manager.operations.interface.NDB", themock=MagicMock())
-        self.check_if_sniffer_exists = self.set_up_patch("vnet_manager.operations.interface.check_if_sniffer_exists")
+        self.iproute_obj.link.return_value = [{"index": 1}]
         self.check_if_sniffer_exists.return_value = True
-        self.tabulate = self.set_up_patch("vnet_manager.operations.interface.tabulate")
-        self.interfaces = self.set_up_patch("vnet_manager.operations.interface.get_vnet_interface_names_from_config")
         self.interfaces.return_value = ["vnet-br0"]
 
     def test_show_vnet_interface_status_calls_iproute(self):
-        show_vnet_interface_status(settings.CONFIG)
+        show_vnet_interface_status(CONFIG)
         self.iproute.assert_called_once_with()
 
     def test_show_vnet_interface_status_calls_ndb(self):
-        show_vnet_interface_status(settings.CONFIG)
+        show_vnet_interface_status(CONFIG)
         self.ndb.assert_called_once_with(log=False)
 
     def test_show_vnet_interfaces_status_calls_get_vnet_interface_names_from_config(self):
-        show_vnet_interface_status(settings.CONFIG)
-        self.interfaces.assert_called_once_with(settings.CONFIG)
+        show_vnet_interface_status(CONFIG)
+        self.interfaces.assert_called_once_with(CONFIG)
 
     def test_show_vnet_interface_status_calls_get_machines_by_vnet_interface_name(self):
         machines = self.set_up_patch("vnet_manager.operations.interface.get_machines_by_vnet_interface_name")
         machines.return_value = []
-        show_vnet_interface_status(settings.CONFIG)
-        machines.assert_called_once_with(settings.CONFIG, self.interfaces.return_value[0])
+        show_vnet_interface_status(CONFIG)
+        machines.assert_called_once_with(CONFIG, self.interfaces.return_value[0])
 
-    def test_show_vnet_interface_status_calls_link_lookup(self):
-        show_vnet_interface_status(settings.CONFIG)
-        self.iproute_obj.link_lookup.assert_called_once_with(ifname=self.interfaces.return_value[0])
+    def test_show_vnet_interface_status_calls_link_get(self):
+        show_vnet_interface_status(CONFIG)
+        self.iproute_obj.link.assert_called_once_with("get", ifname=self.interfaces.return_value[0])
 
     def test_show_vnet_interface_status_calls_check_if_sniffer_exists(self):
-        show_vnet_interface_status(settings.CONFIG)
+        show_vnet_interface_status(CONFIG)
         self.check_if_sniffer_exists.assert_called_once_with(self.interfaces.return_value[0])
 
     def test_show_vnet_interface_status_calls_tabulate(self):
-        show_vnet_interface_status(settings.CONFIG)
+        show_vnet_interface_status(CONFIG)
         self.tabulate.assert_called_once_with(
             [["vnet-br0", ANY, ANY, self.check_if_sniffer_exists.return_value, True, "router100, router101"]],
             headers=["Name", "Status", "L2_addr", "Sniffer", "STP", "Used by"],
@@ -100,8 +143,8 @@ class TestShowVNetInterfaceStatus(VNetTestCase):
         )
 
     def test_show_vnet_interface_status_makes_correct_output_if_interface_does_not_exist(self):
-        self.iproute_obj.link_lookup.return_value = []
-        show_vnet_interface_status(settings.CONFIG)
+        self.iproute_obj.link.side_effect = NetlinkError(19)
+        show_vnet_interface_status(CONFIG)
         self.assertFalse(self.check_if_sniffer_exists.called)
         self.tabulate.assert_called_once_with(
             [["vnet-br0", "NA", "NA", "NA", "NA", "router100, router101"]],
@@ -111,7 +154,7 @@ class TestShowVNetInterfaceStatus(VNetTestCase):
 
     def test_show_vnet_interface_status_displays_result_if_check_if_sniffer_exists(self):
         self.check_if_sniffer_exists.return_value = False
-        show_vnet_interface_status(settings.CONFIG)
+        show_vnet_interface_status(CONFIG)
         self.tabulate.assert_called_once_with(
             [["vnet-br0", ANY, ANY, self.check_if_sniffer_exists.return_value, True, "router100, router101"]],
             headers=["Name", "Status", "L2_addr", "Sniffer", "STP", "Used by"],
@@ -120,50 +163,52 @@ class TestShowVNetInterfaceStatus(VNetTestCase):
 
 
 class TestShowVNetVethInterfaceStatus(VNetTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        mocks = cls.set_up_class_patches("vnet_manager.operations.interface", _get_ipr=None, tabulate=None)
+        cls.iproute = mocks["_get_ipr"]
+        cls.tabulate = mocks["tabulate"]
+
     def setUp(self) -> None:
+        self.iproute.reset_mock(return_value=True, side_effect=True)
+        self.tabulate.reset_mock(return_value=True, side_effect=True)
         self.iproute_obj = Mock()
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
         self.iproute.return_value = self.iproute_obj
-        self.iproute_obj.link.return_value = [
+        self.iproute_obj.get_links.return_value = [
+            {
+                "index": 1,
+                "state": "up",
+                "attrs": [("IFLA_IFNAME", "vnet-veth0"), ("IFLA_ADDRESS", "mac0"), ("IFLA_LINK", 2), ("IFLA_MASTER", 3)],
+            },
             {
+                "index": 2,
                 "state": "up",
-                "attrs": [
-                    ("IFLA_ADDRESS", "mac"),
-                    ("IFLA_LINK", "dev2"),
-                    ("IFLA_IFNAME", "peer"),
-                    ("IFLA_MASTER", "eth0"),
-                    ("IFLA_IFNAME", "master"),
-                ],
-            }
+                "attrs": [("IFLA_IFNAME", "vnet-veth1"), ("IFLA_ADDRESS", "mac1"), ("IFLA_LINK", 1), ("IFLA_MASTER", 4)],
+            },
+            {"index": 3, "state": "up", "attrs": [("IFLA_IFNAME", "vnet-br0")]},
+            {"index": 4, "state": "up", "attrs": [("IFLA_IFNAME", "vnet-br1")]},
         ]
-        self.iproute_obj.link_lookup.return_value = ["dev1"]
-        self.tabulate = self.set_up_patch("vnet_manager.operations.interface.tabulate")
 
     def test_show_vnet_veth_interface_status_calls_iproute(self):
-        show_vnet_veth_interface_status(settings.CONFIG)
+        show_vnet_veth_interface_status(CONFIG)
         self.iproute.assert_called_once_with()
 
-    def test_show_vnet_veth_interface_status_calls_ip_lookup(self):
-        calls = [call(ifname=i) for i in settings.CONFIG["veths"]]
-        show_vnet_veth_interface_status(settings.CONFIG)
-        self.iproute_obj.link_lookup.assert_has_calls(calls)
-
-    def test_show_vnet_veth_interface_status_calls_ip_link(self):
-        show_vnet_veth_interface_status(settings.CONFIG)
-        calls = [call("get", index="dev1"), call("get", index="dev2"), call("get", index="eth0")]
-        self.iproute_obj.link.assert_has_calls(calls)
+    def test_show_vnet_veth_interface_status_calls_get_links_only_once(self):
+        show_vnet_veth_interface_status(CONFIG)
+        self.iproute_obj.get_links.assert_called_once_with()
 
     def test_show_vnet_veth_interface_status_calls_tabulate(self):
-        show_vnet_veth_interface_status(settings.CONFIG)
+        show_vnet_veth_interface_status(CONFIG)
         self.tabulate.assert_called_once_with(
-            [["vnet-veth1", "up", "mac", "peer", "peer"], ["vnet-veth0", "up", "mac", "peer", "peer"]],
+            [["vnet-veth1", "up", "mac1", "vnet-veth0", "vnet-br1"], ["vnet-veth0", "up", "mac0", "vnet-veth1", "vnet-br0"]],
             headers=["Name", "Status", "L2_addr", "Peer", "Master"],
             tablefmt="pretty",
         )
 
     def test_show_vnet_veth_interface_status_calls_tabulate_when_dev_does_not_exist(self):
-        self.iproute_obj.link_lookup.return_value = []
-        show_vnet_veth_interface_status(settings.CONFIG)
+        self.iproute_obj.get_links.return_value = []
+        show_vnet_veth_interface_status(CONFIG)
         self.tabulate.assert_called_once_with(
             [["vnet-veth1", "NA", "NA", "NA", "vnet-br1"], ["vnet-veth0", "NA", "NA", "NA", "vnet-br0"]],
             headers=["Name", "Status", "L2_addr", "Peer", "Master"],
@@ -172,26 +217,37 @@ class TestShowVNetVethInterfaceStatus(VNetTestCase):
 
 
 class TestCheckIfInterfaceExists(VNetTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.iproute = cls.set_up_class_patch("vnet_manager.operations.interface._get_ipr")
+
     def setUp(self) -> None:
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
-        self.iproute.return_value.link_lookup.return_value = [1]
+        self.iproute.reset_mock(return_value=True, side_effect=True)
+        self.iproute.return_value.link.return_value = [{"index": 1}]
 
-    def test_check_if_interface_exists_calls_iproute_lookup(self):
+    def test_check_if_interface_exists_calls_iproute_link_get(self):
         check_if_interface_exists("dev1")
-        self.iproute.return_value.link_lookup.assert_called_once_with(ifname="dev1")
+        self.iproute.return_value.link.assert_called_once_with("get", ifname="dev1")
 
     def test_check_if_interface_exists_returns_true_if_it_exists(self):
         self.assertTrue(check_if_interface_exists("dev1"))
 
     def test_check_if_interface_exists_returns_false_if_it_does_not_exist(self):
-        self.iproute.return_value.link_lookup.return_value = []
+        self.iproute.return_value.link.side_effect = NetlinkError(19)
         self.assertFalse(check_if_interface_exists("dev1"))
 
 
 class TestCreateVNetInterface(VNetTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.iproute = cls.set_up_class_patch("vnet_manager.operations.interface._get_ipr")
+        cls.configure_int = cls.set_up_class_patch("vnet_manager.operations.interface.configure_vnet_interface")
+
     def setUp(self) -> None:
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
-        self.configure_int = self.set_up_patch("vnet_manager.operations.interface.configure_vnet_interface")
+        self.iproute.reset_mock(return_value=True, side_effect=True)
+        self.configure_int.reset_mock(return_value=True, side_effect=True)
 
     def test_create_vnet_interface_calls_iproute_link_add(self):
         create_vnet_interface("dev1")
@@ -203,60 +259,94 @@ class TestCreateVNetInterface(VNetTestCase):
 
 
 class TestCreateVethInterface(VNetTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.iproute = cls.set_up_class_patch("vnet_manager.operations.interface._get_ipr")
+
     def setUp(self) -> None:
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
+        self.iproute.reset_mock(return_value=True, side_effect=True)
 
     def test_create_veth_interface_calls_iproute_link_add(self):
-        create_veth_interface("vnet-veth0", settings.CONFIG["veths"]["vnet-veth0"])
+        create_veth_interface("vnet-veth0", VETHS["vnet-veth0"])
         self.iproute.return_value.link.assert_called_once_with("add", ifname="vnet-veth0", kind="veth", peer="vnet-veth1")
 
     def test_create_veth_interface_does_nothing_when_called_with_interface_without_a_peer(self):
-        create_veth_interface("vneth-veth0", settings.CONFIG["veths"]["vnet-veth1"])
+        create_veth_interface("vneth-veth0", VETHS["vnet-veth1"])
         self.assertFalse(self.iproute.return_value.link.called)
 
 
 class TestCreateVNetInterfaceIPtablesDropRules(VNetTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        mocks = cls.set_up_class_patches("vnet_manager.operations.interface", check_output=None, run=None, logger=None)
+        cls.check_output = mocks["check_output"]
+        cls.iptables_restore = mocks["run"]
+        cls.logger = mocks["logger"]
+
     def setUp(self) -> None:
-        self.check_call = self.set_up_patch("vnet_manager.operations.interface.check_call")
-        self.check_call.side_effect = [CalledProcessError(1, "test"), 0]
-        self.logger = self.set_up_patch("vnet_manager.operations.interface.logger")
+        for shared_mock in (self.check_output, self.iptables_restore, self.logger):
+            shared_mock.reset_mock(return_value=True, side_effect=True)
+        self.check_output.return_value = b"*filter\nCOMMIT\n"
 
-    def test_create_vnet_interface_iptables_drop_rules_makes_correct_check_call_calls(self):
-        calls = [
-            call(shlex.split("iptables -C OUTPUT -o dev1 -j DROP"), stderr=DEVNULL),
-            call(shlex.split("iptables -A OUTPUT -o dev1 -j DROP")),
-        ]
+    def test_create_vnet_interface_iptables_drop_rules_makes_correct_calls(self):
         create_vnet_interface_iptables_rules("dev1")
-        self.check_call.assert_has_calls(calls)
+        self.check_output.assert_called_once_with(shlex.split("iptables-save -t filter"))
+        self.iptables_restore.assert_called_once_with(
+            shlex.split("iptables-restore --noflush"), input=b"*filter\n-A OUTPUT -o dev1 -j DROP\nCOMMIT\n", check=True
+        )
         self.logger.info.assert_called_once_with("Creating IPtables DROP rule to the outside world for VNet interface dev1")
 
     def test_create_vnet_interface_iptables_drop_rules_does_not_add_rules_if_they_already_exist(self):
-        self.check_call.side_effect = [0, 0]
+        self.check_output.return_value = b"*filter\n-A OUTPUT -o dev1 -j DROP\nCOMMIT\n"
         create_vnet_interface_iptables_rules("dev1")
-        self.check_call.assert_called_once_with(shlex.split("iptables -C OUTPUT -o dev1 -j DROP"), stderr=DEVNULL)
+        self.assertFalse(self.iptables_restore.called)
         self.logger.debug.assert_called_once_with("IPtables DROP rule for VNet interface dev1 already exists, skipping creation")
 
-    def test_create_vnet_interface_iptables_drop_rules_logs_error_if_both_commands_fail(self):
-        self.check_call.side_effect = [CalledProcessError(1, "test"), CalledProcessError(1, "test")]
+    def test_create_vnet_interface_iptables_drop_rules_logs_error_if_restore_fails(self):
+        self.iptables_restore.side_effect = CalledProcessError(1, "test")
         create_vnet_interface_iptables_rules("dev1")
-        self.logger.error.assert_called_once_with("Unable to create IPtables rule, got output: None")
+        self.logger.error.assert_called_once_with("Unable to create IPtables rules, got output: None")
+
+    def test_create_vnet_interface_iptables_rules_bulk_only_adds_the_missing_rules(self):
+        self.check_output.return_value = b"*filter\n-A OUTPUT -o dev1 -j DROP\nCOMMIT\n"
+        create_vnet_interface_iptables_rules_bulk(["dev1", "dev2", "dev3"])
+        self.check_output.assert_called_once_with(shlex.split("iptables-save -t filter"))
+        self.iptables_restore.assert_called_once_with(
+            shlex.split("iptables-restore --noflush"),
+            input=b"*filter\n-A OUTPUT -o dev2 -j DROP\n-A OUTPUT -o dev3 -j DROP\nCOMMIT\n",
+            check=True,
+        )
+
+    def test_create_vnet_interface_iptables_rules_bulk_logs_error_if_listing_the_rules_fails(self):
+        self.check_output.side_effect = CalledProcessError(1, "test")
+        create_vnet_interface_iptables_rules_bulk(["dev1"])
+        self.assertFalse(self.iptables_restore.called)
+        self.logger.error.assert_called_once_with("Unable to list the existing IPtables rules, got output: None")
 
 
 class TestConfigureVNetInterface(VNetTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.iproute = cls.set_up_class_patch("vnet_manager.operations.interface._get_ipr")
+        cls.rand_mac = cls.set_up_class_patch("vnet_manager.operations.interface.random_mac_generator")
+
     def setUp(self) -> None:
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
+        self.iproute.reset_mock(return_value=True, side_effect=True)
+        self.rand_mac.reset_mock(return_value=True, side_effect=True)
         self.iproute_obj = Mock()
         self.iproute.return_value = self.iproute_obj
-        self.iproute_obj.link_lookup.return_value = [1]
-        self.rand_mac = self.set_up_patch("vnet_manager.operations.interface.random_mac_generator")
+        self.iproute_obj.link.return_value = [{"index": 1}]
 
     def test_configure_vnet_interfaces_calls_ip_route(self):
         configure_vnet_interface("test")
-        self.iproute.assert_called_once_with()
+        self.assertTrue(self.iproute.called)
 
     def test_configure_vnet_interface_looks_up_passed_interface(self):
         configure_vnet_interface("test")
-        self.iproute_obj.link_lookup.assert_called_once_with(ifname="test")
+        self.iproute_obj.link.assert_any_call("get", ifname="test")
 
     def test_configure_vnet_interface_calls_random_mac_generator(self):
         configure_vnet_interface("test")
@@ -273,30 +363,35 @@ class TestConfigureVNetInterface(VNetTestCase):
 
 
 class TestConfigureVethInterface(VNetTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.iproute = cls.set_up_class_patch("vnet_manager.operations.interface._get_ipr")
+
     def setUp(self) -> None:
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
+        self.iproute.reset_mock(return_value=True, side_effect=True)
         self.iproute_obj = Mock()
         self.iproute.return_value = self.iproute_obj
-        self.iproute_obj.link_lookup.side_effect = [[1], [2]]
-        self.data = settings.CONFIG["veths"]["vnet-veth1"]
+        self.iproute_obj.link.side_effect = [[{"index": 1}], [{"index": 2}], None]
+        self.data = VETHS["vnet-veth1"]
 
     def test_configure_veth_interface_calls_ip_route(self):
         configure_veth_interface("test", self.data)
-        self.iproute.assert_called_once_with()
+        self.assertTrue(self.iproute.called)
 
     def test_configure_veth_interface_makes_correct_ip_lookup_calls(self):
-        calls = [call(ifname="test"), call(ifname=settings.CONFIG["veths"]["vnet-veth1"]["bridge"])]
+        calls = [call("get", ifname="test"), call("get", ifname=VETHS["vnet-veth1"]["bridge"])]
         configure_veth_interface("test", self.data)
-        self.iproute_obj.link_lookup.assert_has_calls(calls)
+        self.iproute_obj.link.assert_has_calls(calls)
 
     def test_configure_veth_interface_calls_ip_link(self):
         configure_veth_interface("test", self.data)
-        self.iproute_obj.link.assert_called_once_with("set", index=1, master=2)
+        self.iproute_obj.link.assert_called_with("set", index=1, master=2)
 
 
 class TestBringUpVNetInterfaces(VNetTestCase):
     def setUp(self) -> None:
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
+        self.iproute = self.set_up_patch("vnet_manager.operations.interface._get_ipr")
         self.iproute_obj = Mock()
         self.iproute.return_value = self.iproute_obj
         self.get_vnet_interface_names = self.set_up_patch("vnet_manager.operations.interface.get_vnet_interface_names_from_config")
@@ -304,12 +399,14 @@ class TestBringUpVNetInterfaces(VNetTestCase):
         self.check_if_interface_exists = self.set_up_patch("vnet_manager.operations.interface.check_if_interface_exists")
         self.check_if_interface_exists.return_value = False
         self.create_vnet_interface = self.set_up_patch("vnet_manager.operations.interface.create_vnet_interface")
-        self.create_vnet_interface_block_rules = self.set_up_patch("vnet_manager.operations.interface.create_vnet_interface_iptables_rules")
+        self.create_vnet_interface_block_rules = self.set_up_patch(
+            "vnet_manager.operations.interface.create_vnet_interface_iptables_rules_bulk"
+        )
         self.check_if_sniffer_exists = self.set_up_patch("vnet_manager.operations.interface.check_if_sniffer_exists")
         self.check_if_sniffer_exists.return_value = False
         self.start_tcpdump_on_interface = self.set_up_patch("vnet_manager.operations.interface.start_tcpdump_on_vnet_interface")
         self.ensure_vnet_veth_interfaces = self.set_up_patch("vnet_manager.operations.interface.ensure_vnet_veth_interfaces")
-        self.config = deepcopy(settings.CONFIG)
+        self.config = deepcopy(CONFIG)
         self.expected_vnet_interface_calls = [call(i) for i in self.get_vnet_interface_names.return_value]
 
     def test_bring_up_vnet_interfaces_calls_ip_route(self):
@@ -333,9 +430,9 @@ class TestBringUpVNetInterfaces(VNetTestCase):
         bring_up_vnet_interfaces(self.config)
         self.assertFalse(self.create_vnet_interface.called)
 
-    def test_bring_up_vnet_interfaces_calls_create_vnet_interface_iptables_rules(self):
+    def test_bring_up_vnet_interfaces_calls_create_vnet_interface_iptables_rules_bulk(self):
         bring_up_vnet_interfaces(self.config)
-        self.create_vnet_interface_block_rules.assert_has_calls(self.expected_vnet_interface_calls)
+        self.create_vnet_interface_block_rules.assert_called_once_with(self.get_vnet_interface_names.return_value)
 
     def test_bring_up_vnet_interfaces_calls_ip_link_to_bring_up_interfaces(self):
         calls = [call("set", ifname=i, state="up") for i in self.get_vnet_interface_names.return_value]
@@ -371,7 +468,7 @@ class TestBringUpVNetInterfaces(VNetTestCase):
 
 class TestEnsureVNetVethInterfaces(VNetTestCase):
     def setUp(self) -> None:
-        self.config = deepcopy(settings.CONFIG)
+        self.config = deepcopy(CONFIG)
         self.ndb = self.set_up_patch("vnet_manager.operations.interface.NDB", themock=MagicMock())
         self.check_if_interface_exists = self.set_up_patch("vnet_manager.operations.interface.check_if_interface_exists")
         self.check_if_interface_exists.return_value = False
@@ -440,11 +537,11 @@ class TestCheckIfSnifferExists(VNetTestCase):
 
 class TestBringDownVNetInterfaces(VNetTestCase):
     def setUp(self) -> None:
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
+        self.iproute = self.set_up_patch("vnet_manager.operations.interface._get_ipr")
         self.iproute_obj = Mock()
         self.iproute.return_value = self.iproute_obj
         self.check_if_interface_exists = self.set_up_patch("vnet_manager.operations.interface.check_if_interface_exists")
-        self.config = deepcopy(settings.CONFIG)
+        self.config = deepcopy(CONFIG)
 
     def test_bring_down_vnet_interfaces_calls_iproute(self):
         bring_down_vnet_interfaces(self.config)
@@ -484,11 +581,11 @@ class TestBringDownVNetInterfaces(VNetTestCase):
 
 class TestDeleteVNetInterfaces(VNetTestCase):
     def setUp(self) -> None:
-        self.iproute = self.set_up_patch("vnet_manager.operations.interface.IPRoute")
+        self.iproute = self.set_up_patch("vnet_manager.operations.interface._get_ipr")
         self.iproute_obj = Mock()
         self.iproute.return_value = self.iproute_obj
         self.check_if_interface_exists = self.set_up_patch("vnet_manager.operations.interface.check_if_interface_exists")
-        self.config = deepcopy(settings.CONFIG)
+        self.config = deepcopy(CONFIG)
 
     def test_delete_vnet_interfaces_calls_iproute(self):
         delete_vnet_interfaces(self.config)